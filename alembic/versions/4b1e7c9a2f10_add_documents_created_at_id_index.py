@@ -0,0 +1,28 @@
+"""add documents created_at id index
+
+Revision ID: 4b1e7c9a2f10
+Revises: da44237e7522
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1e7c9a2f10'
+down_revision: Union[str, Sequence[str], None] = 'da44237e7522'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_documents_created_at_id', 'documents', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documents_created_at_id', table_name='documents')
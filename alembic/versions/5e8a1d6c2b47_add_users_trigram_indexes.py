@@ -0,0 +1,47 @@
+"""add users trigram indexes
+
+Revision ID: 5e8a1d6c2b47
+Revises: b7e2a94d03c5
+Create Date: 2026-10-18 18:20:41.915304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a1d6c2b47'
+down_revision: Union[str, Sequence[str], None] = 'b7e2a94d03c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+    # Built without locking users against writes; CONCURRENTLY cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_full_name_trgm', 'users', [sa.text('f_unaccent(full_name) gin_trgm_ops')], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_users_organization_trgm', 'users', [sa.text('f_unaccent(organization) gin_trgm_ops')], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_users_email_trgm', 'users', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_users_iin_trgm', 'users', ['iin'], unique=False, postgresql_using='gin', postgresql_ops={'iin': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_users_bin_trgm', 'users', ['bin'], unique=False, postgresql_using='gin', postgresql_ops={'bin': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_bin_trgm', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_iin_trgm', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_email_trgm', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_organization_trgm', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_full_name_trgm', table_name='users', postgresql_concurrently=True)
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
@@ -0,0 +1,140 @@
+"""move document files to blob store
+
+Revision ID: 8c3d51f0e6a2
+Revises: 4b1e7c9a2f10
+Create Date: 2026-10-18 11:40:07.915264
+
+"""
+from typing import Sequence, Tuple, Union
+import base64
+import hashlib
+import os
+import tempfile
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3d51f0e6a2'
+down_revision: Union[str, Sequence[str], None] = '4b1e7c9a2f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 100
+
+
+# The blob layout as of this revision, kept here so the migration does not
+# change when services/blob_service.py does. The directory comes from
+# `alembic -x blob_storage_dir=...` or BLOB_STORAGE_DIR.
+def _blob_dir() -> str:
+    return (
+        context.get_x_argument(as_dictionary=True).get("blob_storage_dir")
+        or os.environ.get("BLOB_STORAGE_DIR")
+        or "storage/blobs"
+    )
+
+
+def _blob_path(sha256: str) -> str:
+    return os.path.join(_blob_dir(), sha256[:2], sha256[2:4], sha256)
+
+
+def _write_blob(data: bytes) -> Tuple[str, int]:
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = _blob_path(sha256)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return sha256, len(data)
+
+
+def _read_blob(sha256: str) -> bytes:
+    with open(_blob_path(sha256), "rb") as f:
+        return f.read()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(length=128), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+    op.add_column('documents', sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_documents_blob_sha256'), 'documents', ['blob_sha256'], unique=False)
+    op.create_foreign_key(
+        'fk_documents_blob_sha256_blobs', 'documents', 'blobs', ['blob_sha256'], ['sha256']
+    )
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, file_base64 FROM documents "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        for doc_id, file_base64 in rows:
+            if file_base64:
+                sha256, size = _write_blob(base64.b64decode(file_base64))
+                conn.execute(
+                    sa.text(
+                        "INSERT INTO blobs (sha256, size, content_type, created_at) "
+                        "VALUES (:sha256, :size, 'application/pdf', now()) "
+                        "ON CONFLICT (sha256) DO NOTHING"
+                    ),
+                    {"sha256": sha256, "size": size},
+                )
+                conn.execute(
+                    sa.text("UPDATE documents SET blob_sha256 = :sha256 WHERE id = :id"),
+                    {"sha256": sha256, "id": doc_id},
+                )
+        last_id = rows[-1][0]
+
+    op.drop_column('documents', 'file_base64')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('documents', sa.Column('file_base64', sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, blob_sha256 FROM documents "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        for doc_id, sha256 in rows:
+            file_base64 = base64.b64encode(_read_blob(sha256)).decode() if sha256 else ""
+            conn.execute(
+                sa.text("UPDATE documents SET file_base64 = :file_base64 WHERE id = :id"),
+                {"file_base64": file_base64, "id": doc_id},
+            )
+        last_id = rows[-1][0]
+
+    op.alter_column('documents', 'file_base64', nullable=False)
+    op.drop_constraint('fk_documents_blob_sha256_blobs', 'documents', type_='foreignkey')
+    op.drop_index(op.f('ix_documents_blob_sha256'), table_name='documents')
+    op.drop_column('documents', 'blob_sha256')
+    op.drop_table('blobs')
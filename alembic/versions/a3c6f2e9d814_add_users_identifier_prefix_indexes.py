@@ -0,0 +1,30 @@
+"""add users identifier prefix indexes
+
+Revision ID: a3c6f2e9d814
+Revises: 5e8a1d6c2b47
+Create Date: 2026-10-18 18:47:09.260178
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c6f2e9d814'
+down_revision: Union[str, Sequence[str], None] = '5e8a1d6c2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_iin_prefix', 'users', ['iin'], unique=False, postgresql_ops={'iin': 'varchar_pattern_ops'})
+    op.create_index('ix_users_bin_prefix', 'users', ['bin'], unique=False, postgresql_ops={'bin': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_bin_prefix', table_name='users')
+    op.drop_index('ix_users_iin_prefix', table_name='users')
@@ -0,0 +1,43 @@
+"""add registration jobs
+
+Revision ID: b7e2a94d03c5
+Revises: 8c3d51f0e6a2
+Create Date: 2026-10-18 14:22:48.306117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2a94d03c5'
+down_revision: Union[str, Sequence[str], None] = '8c3d51f0e6a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'registration_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('signature', sa.Text(), nullable=False),
+        sa.Column('participant_count', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_registration_jobs_document_id'), 'registration_jobs', ['document_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_registration_jobs_document_id'), table_name='registration_jobs')
+    op.drop_table('registration_jobs')
@@ -0,0 +1,32 @@
+"""add registration job lease and s_id
+
+Revision ID: c5d2e8b41f37
+Revises: a3c6f2e9d814
+Create Date: 2026-10-19 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2e8b41f37'
+down_revision: Union[str, Sequence[str], None] = 'a3c6f2e9d814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('registration_jobs', sa.Column('s_id', sa.String(length=128), nullable=True))
+    op.add_column('registration_jobs', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_registration_jobs_status'), 'registration_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_registration_jobs_status'), table_name='registration_jobs')
+    op.drop_column('registration_jobs', 'lease_expires_at')
+    op.drop_column('registration_jobs', 's_id')
@@ -0,0 +1,42 @@
+"""add document participants listing index
+
+Revision ID: e1b7a4c9d250
+Revises: c5d2e8b41f37
+Create Date: 2026-10-18 22:05:17.380214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7a4c9d250'
+down_revision: Union[str, Sequence[str], None] = 'c5d2e8b41f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('document_participants', sa.Column('document_created_at', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE document_participants AS p SET document_created_at = d.created_at "
+        "FROM documents AS d WHERE d.id = p.document_id"
+    )
+    op.alter_column('document_participants', 'document_created_at', nullable=False)
+    op.create_index(
+        'ix_document_participants_listing',
+        'document_participants',
+        ['user_id', 'status', 'document_created_at', 'document_id'],
+        unique=False,
+    )
+    op.drop_index('ix_documents_created_at_id', table_name='documents')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_documents_created_at_id', 'documents', ['created_at', 'id'], unique=False)
+    op.drop_index('ix_document_participants_listing', table_name='document_participants')
+    op.drop_column('document_participants', 'document_created_at')
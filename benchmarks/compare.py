@@ -0,0 +1,39 @@
+import argparse
+import json
+
+
+def _rows(report: dict) -> dict:
+    rows = {}
+    for row in report.get("signature_page", []):
+        rows[f"signature_page pages={row['pages']} signers={row['signers']} {row['mode']}"] = row
+    for db in report.get("database", []):
+        for name, listing in db["listing"].items():
+            for page, summary in listing.items():
+                rows[f"listing users={db['users']} {name} {page}"] = summary
+        for kind, summary in db["partner_search"].items():
+            rows[f"partner_search users={db['users']} {kind}"] = summary
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p50_ms")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = _rows(json.load(fh))
+    with open(args.candidate, encoding="utf-8") as fh:
+        candidate = _rows(json.load(fh))
+
+    print(f"{'benchmark':<60} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for name in sorted(baseline.keys() & candidate.keys()):
+        old = baseline[name][args.metric]
+        new = candidate[name][args.metric]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{name:<60} {old:>10.2f} {new:>10.2f} {change:>+7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import base64
+import random
+from io import BytesIO
+
+from PIL import Image
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+
+def make_document(path: str, pages: int) -> None:
+    c = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for page in range(pages):
+        y = height - 60
+        for line in range(45):
+            c.drawString(60, y, f"Page {page + 1}, line {line + 1}: " + "lorem ipsum dolor sit amet " * 3)
+            y -= 16
+        c.showPage()
+    c.save()
+
+
+def make_qr_png(seed: str, modules: int = 117, scale: int = 4) -> str:
+    # Random module matrix with the size of a version 25 QR code; only the
+    # image weight matters for rendering cost, not that it scans.
+    rng = random.Random(seed)
+    image = Image.new("1", (modules, modules))
+    image.putdata([rng.randint(0, 1) * 255 for _ in range(modules * modules)])
+    image = image.resize((modules * scale, modules * scale), Image.NEAREST)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def make_signature_data(signers: int) -> dict:
+    signatures = []
+    for i in range(signers):
+        signatures.append({
+            "sign_id": i + 1,
+            "signed_at": "01.01.2025 10:00:00",
+            "subject": f"CN=ТЕСТОВ ТЕСТ {i},SERIALNUMBER=IIN{100000000000 + i},GIVENNAME=ТЕСТОВИЧ,C=KZ",
+            "iin": str(100000000000 + i),
+            "key_usages": ["digitalSignature", "nonRepudiation"],
+            "validity": {"from": "01.01.2024 00:00:00", "until": "01.01.2026 00:00:00"},
+            "issuer": "CN=ҰЛТТЫҚ КУӘЛАНДЫРУШЫ ОРТАЛЫҚ (RSA),C=KZ",
+            "qr_codes": [make_qr_png(f"sigex:{i}:{n}") for n in range(4)],
+        })
+    return {"total_signatures": signers, "signatures": signatures}
@@ -0,0 +1,197 @@
+"""End-to-end load driver: login -> create -> multi-party sign, run concurrently.
+
+Start the SIGEX mock, then the application pointed at it, then::
+
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --flows 200 --concurrency 20 --signers 2
+
+Every flow logs in an initiator and ``--signers`` partners, uploads a PDF,
+waits for its registration job, and has each partner sign in turn. Latency
+percentiles and throughput are reported per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.fixtures import make_document
+from benchmarks.sigex_mock import mock_signature
+from benchmarks.timing import summarize
+
+IIN_BASE = 700_000_000_000
+
+
+class FlowError(Exception):
+    pass
+
+
+class Recorder:
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.errors[name] += 1
+            raise FlowError(f"{name}: {e!r}")
+        self.timings[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            raise FlowError(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    def record(self, name: str, elapsed: float) -> None:
+        self.timings[name].append(elapsed)
+
+
+async def login(client: httpx.AsyncClient, recorder: Recorder, iin: str) -> int:
+    nonce = (await recorder.call(client, "POST /get", "POST", "/get")).json()["nonce"]
+    response = await recorder.call(
+        client, "POST /check", "POST", "/check",
+        json={"nonce": nonce, "signature": mock_signature(iin, f"НАГРУЗКА{iin[-4:]}", "ТЕСТ ТЕСТОВИЧ")},
+    )
+    return response.json()["user_id"]
+
+
+async def wait_for_registration(client: httpx.AsyncClient, recorder: Recorder, job_id: str, timeout: float) -> int:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = (await recorder.call(client, "GET /documents/jobs/{id}", "GET", f"/documents/jobs/{job_id}")).json()
+        if job["status"] == "succeeded":
+            return job["document_id"]
+        if job["status"] == "failed":
+            raise FlowError(f"registration failed: {job['error']}")
+        await asyncio.sleep(0.2)
+    raise FlowError("registration timed out")
+
+
+async def sign_as(client: httpx.AsyncClient, recorder: Recorder, iin: str, document_id: int) -> None:
+    pending = (await recorder.call(
+        client, "GET /documents/pending", "GET", "/documents/pending", params={"limit": 50}
+    )).json()
+    if not any(doc["id"] == document_id for doc in pending["documents"]):
+        raise FlowError(f"document {document_id} is not pending for {iin}")
+    await recorder.call(
+        client, "POST /sign/addsign", "POST", "/sign/addsign",
+        json={"document_id": document_id, "signature": mock_signature(iin, f"НАГРУЗКА{iin[-4:]}", "ТЕСТ ТЕСТОВИЧ")},
+    )
+
+
+async def run_flow(index: int, args, pdf: bytes, recorder: Recorder) -> None:
+    iins = [f"{IIN_BASE + index * 10 + k}" for k in range(args.signers + 1)]
+    clients = [httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) for _ in iins]
+    try:
+        user_ids = [await login(client, recorder, iin) for client, iin in zip(clients, iins)]
+
+        initiator = clients[0]
+        started = time.perf_counter()
+        response = await recorder.call(
+            initiator, "POST /documents/upload", "POST", "/documents/upload",
+            data={
+                "title": f"Нагрузочный договор {index}",
+                "file_name": f"load_{index}.pdf",
+                "signature": mock_signature(iins[0], f"НАГРУЗКА{iins[0][-4:]}", "ТЕСТ ТЕСТОВИЧ"),
+                "participant_user_ids": [str(uid) for uid in user_ids[1:]],
+            },
+            files={"file": (f"load_{index}.pdf", pdf, "application/pdf")},
+        )
+        document_id = await wait_for_registration(initiator, recorder, response.json()["job_id"], args.timeout)
+        recorder.record("registration (upload to job done)", time.perf_counter() - started)
+
+        for client, iin in zip(clients[1:], iins[1:]):
+            await sign_as(client, recorder, iin, document_id)
+    finally:
+        for client in clients:
+            await client.aclose()
+
+
+async def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.pdf")
+        make_document(path, args.pages)
+        with open(path, "rb") as fh:
+            pdf = fh.read()
+
+    recorder = Recorder()
+    slots = asyncio.Semaphore(args.concurrency)
+    failures: List[str] = []
+
+    async def guarded(index: int) -> None:
+        async with slots:
+            try:
+                await run_flow(args.offset + index, args, pdf, recorder)
+            except FlowError as e:
+                failures.append(str(e))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[guarded(i) for i in range(args.flows)])
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name, timings in sorted(recorder.timings.items()):
+        endpoints[name] = {
+            **summarize(timings),
+            "errors": recorder.errors.get(name, 0),
+            "per_second": len(timings) / elapsed,
+        }
+    for name, count in recorder.errors.items():
+        endpoints.setdefault(name, {"count": 0, "errors": count, "per_second": 0.0})
+    return {
+        "flows": args.flows,
+        "concurrency": args.concurrency,
+        "signers": args.signers,
+        "pages": args.pages,
+        "elapsed_s": elapsed,
+        "flows_completed": args.flows - len(failures),
+        "flows_per_second": (args.flows - len(failures)) / elapsed,
+        "failures": failures[:20],
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test login, document creation and signing end to end")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--flows", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--signers", type=int, default=2, choices=range(1, 5))
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--offset", type=int, default=0, help="shift the generated IINs to start with fresh users")
+    parser.add_argument("--out", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    print(
+        f"{report['flows_completed']}/{report['flows']} flows in {report['elapsed_s']:.1f}s "
+        f"({report['flows_per_second']:.2f} flows/s)"
+    )
+    print(f"{'endpoint':<38} {'count':>6} {'err':>5} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, row in report["endpoints"].items():
+        if not row["count"]:
+            print(f"{name:<38} {0:>6} {row['errors']:>5}")
+            continue
+        print(
+            f"{name:<38} {row['count']:>6} {row['errors']:>5} {row['per_second']:>7.2f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+    for failure in report["failures"]:
+        print(f"failed: {failure}", file=sys.stderr)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
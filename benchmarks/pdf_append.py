@@ -0,0 +1,57 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from services.pdf_signature_service import PDFSignatureService
+
+from benchmarks.fixtures import make_document, make_signature_data
+
+DEFAULT_PAGES = [1, 10, 50, 100, 300]
+
+
+def run(pages_list, signers: int, repeat: int) -> list:
+    service = PDFSignatureService()
+    signature_data = make_signature_data(signers)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in pages_list:
+            source = os.path.join(tmp, f"source_{pages}.pdf")
+            make_document(source, pages)
+            for mode in ("rewrite", "incremental"):
+                timings = []
+                for _ in range(repeat):
+                    target = os.path.join(tmp, f"target_{pages}_{mode}.pdf")
+                    shutil.copyfile(source, target)
+                    started = time.perf_counter()
+                    service.append_signature_page(target, signature_data, mode=mode)
+                    timings.append(time.perf_counter() - started)
+                results.append({
+                    "pages": pages,
+                    "mode": mode,
+                    "source_bytes": os.path.getsize(source),
+                    "result_bytes": os.path.getsize(target),
+                    "best_ms": min(timings) * 1000,
+                    "mean_ms": sum(timings) / len(timings) * 1000,
+                })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare rewrite and incremental signature page appending")
+    parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES)
+    parser.add_argument("--signers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'mode':>12} {'source KB':>10} {'result KB':>10} {'best ms':>9} {'mean ms':>9}")
+    for row in run(args.pages, args.signers, args.repeat):
+        print(
+            f"{row['pages']:>6} {row['mode']:>12} {row['source_bytes'] / 1024:>10.1f} "
+            f"{row['result_bytes'] / 1024:>10.1f} {row['best_ms']:>9.1f} {row['mean_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import random
+import time
+
+from db.session import SessionLocal
+from routers.documents import search_partners
+from services.document_service import get_pending_documents, get_signed_documents
+from services.partner_search_cache import partner_search_cache
+
+from benchmarks.seed import FIRST_NAMES, LAST_NAMES, owner_ids
+from benchmarks.timing import summarize
+
+DEEP_PAGES = 5
+
+
+async def _timed(fn, *args, **kwargs):
+    async with SessionLocal() as session:
+        started = time.perf_counter()
+        result = await fn(session, *args, **kwargs)
+        return time.perf_counter() - started, result
+
+
+async def bench_listing(users: int, samples: int, limit: int) -> dict:
+    results = {}
+    for name, fn in (("pending", get_pending_documents), ("signed", get_signed_documents)):
+        first_page, next_pages = [], []
+        for uid in owner_ids(users, samples):
+            elapsed, page = await _timed(fn, uid, limit=limit)
+            first_page.append(elapsed)
+            cursor = page["next_cursor"]
+            for _ in range(DEEP_PAGES):
+                if not cursor:
+                    break
+                elapsed, page = await _timed(fn, uid, limit=limit, cursor=cursor)
+                next_pages.append(elapsed)
+                cursor = page["next_cursor"]
+        results[name] = {"first_page": summarize(first_page)}
+        if next_pages:
+            results[name]["next_pages"] = summarize(next_pages)
+    return results
+
+
+def partner_queries(users: int, samples: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    ids = [rng.randint(1, users) for _ in range(samples)]
+    return {
+        "identifier_exact": [f"{i:012d}" for i in ids],
+        "identifier_prefix": [f"{i:012d}"[:8] for i in ids],
+        "email": [f"user{2 * max(i // 2, 1)}@exa" for i in ids],
+        "name": [f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)[:4]}" for _ in ids],
+        "name_typo": [rng.choice(LAST_NAMES)[:-2] + rng.choice("аеоу") for _ in ids],
+    }
+
+
+async def _search(session, query: str, limit: int):
+    return await search_partners(q=query, limit=limit, uid=None, session=session)
+
+
+async def bench_search(users: int, samples: int, limit: int) -> dict:
+    # Measure the database path, not the typeahead cache.
+    max_size = partner_search_cache.max_size
+    partner_search_cache.max_size = 0
+    partner_search_cache.invalidate()
+    try:
+        results = {}
+        for kind, queries in partner_queries(users, samples).items():
+            timings = []
+            for query in queries:
+                elapsed, _ = await _timed(_search, query, limit)
+                timings.append(elapsed)
+            results[kind] = summarize(timings)
+        return results
+    finally:
+        partner_search_cache.max_size = max_size
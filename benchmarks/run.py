@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+DEFAULT_USERS = [10_000, 100_000, 1_000_000]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _bench_databases(args) -> list:
+    from db.session import engine
+    from benchmarks.seed import seed
+    from benchmarks.queries import bench_listing, bench_search
+
+    results = []
+    try:
+        for users in args.users:
+            documents = int(users * args.documents_ratio)
+            print(f"seeding {users} users / {documents} documents", file=sys.stderr)
+            await seed(users, documents)
+            print(f"measuring listings and partner search at {users} users", file=sys.stderr)
+            results.append({
+                "users": users,
+                "documents": documents,
+                "listing": await bench_listing(users, args.samples, args.page_size),
+                "partner_search": await bench_search(users, args.samples, args.search_limit),
+            })
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark signature pages, document listings and partner search")
+    parser.add_argument("--out", default="benchmark-results.json", help="where to write the JSON results")
+    parser.add_argument("--skip-pdf", action="store_true")
+    parser.add_argument("--pages", type=int, nargs="+")
+    parser.add_argument("--signers", type=int, nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=["incremental", "rewrite"])
+    parser.add_argument(
+        "--database-url",
+        help="database to seed and query; it is dropped and recreated, never point this at real data",
+    )
+    parser.add_argument("--users", type=int, nargs="+", default=DEFAULT_USERS)
+    parser.add_argument("--documents-ratio", type=float, default=1.0)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--search-limit", type=int, default=10)
+    args = parser.parse_args()
+
+    # Settings are read on import, so the target database has to be in the
+    # environment before any application module is loaded.
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://unused/unused")
+
+    from benchmarks.signature_page import bench_signature_page, DEFAULT_PAGES, DEFAULT_SIGNERS
+
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    if not args.skip_pdf:
+        print("measuring signature pages", file=sys.stderr)
+        report["signature_page"] = bench_signature_page(
+            args.pages or DEFAULT_PAGES, args.signers or DEFAULT_SIGNERS, args.repeat, args.mode
+        )
+    if args.database_url:
+        report["database"] = asyncio.run(_bench_databases(args))
+    else:
+        print("no --database-url given, skipping database benchmarks", file=sys.stderr)
+
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    print(f"results written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
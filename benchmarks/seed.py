@@ -0,0 +1,92 @@
+import hashlib
+
+from sqlalchemy import text
+
+from db.models import Base
+from db.session import engine, init_db
+
+LAST_NAMES = [
+    "Иванов", "Ахметов", "Сейтказиев", "Петров", "Нурланов", "Жумабаев", "Касымов", "Смирнов",
+    "Абдрахманов", "Омаров", "Кузнецов", "Бекмуханбетов", "Тулеуов", "Ёлкин", "Әлиев", "Сулейменов",
+]
+FIRST_NAMES = [
+    "Алексей", "Айгерим", "Ержан", "Мария", "Нұрсұлтан", "Дмитрий", "Асель", "Бауыржан",
+    "Ольга", "Данияр", "Жанар", "Сергей", "Қайрат", "Елена", "Арман", "Гульнара",
+]
+ORGANIZATIONS = [
+    "ТОО «Казахтелеком Сервис»", "АО «КазМунайГаз»", "ТОО «Алматы Строй»", "ИП Сейтказиев",
+    "ТОО «Астана Логистик»", "АО «Халык Банк»", "ТОО «Qazaq Digital»", "ТОО «Әлем Trade»",
+]
+
+BLOB_SHA256 = hashlib.sha256(b"docsign benchmark").hexdigest()
+
+
+def _array(values) -> str:
+    return "ARRAY[" + ", ".join("'" + v.replace("'", "''") + "'" for v in values) + "]"
+
+
+async def seed(users: int, documents: int) -> None:
+    """Recreates the schema and fills it with ``users`` users and ``documents`` documents.
+
+    One percent of the users own all documents, so a few accounts have long
+    listings, and every document has one to four signers.
+    """
+    owners = max(users // 100, 1)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"""
+            INSERT INTO users (iin, bin, full_name, organization, email, created_at, updated_at)
+            SELECT
+                lpad(g::text, 12, '0'),
+                CASE WHEN g % 3 = 0 THEN lpad((900000000000 + g)::text, 12, '0') END,
+                ({_array(LAST_NAMES)})[1 + g % {len(LAST_NAMES)}] || ' ' ||
+                    ({_array(FIRST_NAMES)})[1 + (g / {len(LAST_NAMES)}) % {len(FIRST_NAMES)}] || ' ' || g,
+                CASE WHEN g % 3 = 0 THEN ({_array(ORGANIZATIONS)})[1 + g % {len(ORGANIZATIONS)}] END,
+                CASE WHEN g % 2 = 0 THEN 'user' || g || '@example.kz' END,
+                now(), now()
+            FROM generate_series(1, :users) AS g
+        """), {"users": users})
+
+        await conn.execute(
+            text("INSERT INTO blobs (sha256, size, content_type, created_at) VALUES (:sha, 0, 'application/pdf', now())"),
+            {"sha": BLOB_SHA256},
+        )
+        await conn.execute(text("""
+            INSERT INTO documents (owner_id, title, file_name, blob_sha256, file_path, s_id, status, created_at, updated_at)
+            SELECT
+                1 + (g::bigint * 7919) % :owners,
+                'Договор № ' || g,
+                'contract_' || g || '.pdf',
+                :sha,
+                'storage/benchmark.pdf',
+                'bench' || g,
+                'pending',
+                now() - make_interval(secs => :documents - g),
+                now()
+            FROM generate_series(1, :documents) AS g
+        """), {"owners": owners, "documents": documents, "sha": BLOB_SHA256})
+
+        await conn.execute(text("""
+            INSERT INTO document_participants (document_id, user_id, role, status, signed_at, document_created_at)
+            SELECT id, owner_id, 'initiator', CASE WHEN id % 2 = 0 THEN 'signed' ELSE 'pending' END, NULL, created_at
+            FROM documents
+        """))
+        await conn.execute(text("""
+            INSERT INTO document_participants (document_id, user_id, role, status, signed_at, document_created_at)
+            SELECT d.id, 1 + (d.id::bigint * 104729 + k * 1299709) % :users, 'signer',
+                   CASE WHEN (d.id + k) % 3 = 0 THEN 'signed' ELSE 'pending' END, NULL, d.created_at
+            FROM documents AS d, generate_series(1, 4) AS k
+            WHERE k <= 1 + d.id % 4
+        """), {"users": users})
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+
+def owner_ids(users: int, count: int) -> list:
+    owners = max(users // 100, 1)
+    return [1 + (i * 7919) % owners for i in range(1, count + 1)]
@@ -0,0 +1,196 @@
+"""Local stand-in for the SIGEX API, for load tests that must not reach sigex.kz.
+
+Run it and point the application at it::
+
+    python -m benchmarks.sigex_mock --port 8100 --latency-ms 80 --jitter-ms 40 --error-rate 0.01
+    AUTH_BASE_URL=http://127.0.0.1:8100 python main.py
+
+Signatures are opaque to the real SIGEX; here a signature of the form
+``mock:<iin>:<surname>:<given name>`` (see ``mock_signature``) decides whose
+certificate the mock reports. Anything else gets a canned identity.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from typing import Any, Dict
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.fixtures import make_qr_png
+
+CANNED_IDENTITY = ("123456789012", "ТЕСТОВ", "ТЕСТ ТЕСТОВИЧ")
+KEY_USAGES = ["digitalSignature", "nonRepudiation"]
+ISSUER = "CN=ҰЛТТЫҚ КУӘЛАНДЫРУШЫ ОРТАЛЫҚ (GOST) TEST 2022,C=KZ"
+
+config: Dict[str, Any] = {
+    "latency_ms": 50.0,
+    "jitter_ms": 25.0,
+    "error_rate": 0.0,
+    "error_status": 503,
+    "qr_codes": 4,
+}
+documents: Dict[str, Dict[str, Any]] = {}
+stats = {"requests": 0, "errors": 0}
+_qr_codes: list = []
+
+app = FastAPI(title="SIGEX mock")
+
+
+def mock_signature(iin: str, surname: str, given_name: str) -> str:
+    return f"mock:{iin}:{surname}:{given_name}"
+
+
+def _identity(signature: str | None):
+    parts = (signature or "").split(":")
+    if len(parts) == 4 and parts[0] == "mock":
+        return parts[1], parts[2], parts[3]
+    return CANNED_IDENTITY
+
+
+def _signature_entry(sign_id: int, signature: str | None) -> Dict[str, Any]:
+    iin, surname, given_name = _identity(signature)
+    now_ms = int(time.time() * 1000)
+    return {
+        "signId": sign_id,
+        "storedAt": now_ms,
+        "subject": f"CN={surname} {given_name.split(' ')[0]},SURNAME={surname},SERIALNUMBER=IIN{iin},C=KZ,GIVENNAME={given_name}",
+        "keyUsages": KEY_USAGES,
+        "from": now_ms - 180 * 24 * 3600 * 1000,
+        "until": now_ms + 180 * 24 * 3600 * 1000,
+        "issuer": ISSUER,
+    }
+
+
+def _qr_payload() -> list:
+    if len(_qr_codes) != config["qr_codes"]:
+        _qr_codes[:] = [make_qr_png(f"sigex-mock:{n}") for n in range(config["qr_codes"])]
+    return list(_qr_codes)
+
+
+@app.middleware("http")
+async def simulate_network(request: Request, call_next):
+    if request.url.path.startswith("/_mock"):
+        return await call_next(request)
+    stats["requests"] += 1
+    delay = max(random.gauss(config["latency_ms"], config["jitter_ms"]), 0.0) / 1000
+    await asyncio.sleep(delay)
+    if random.random() < config["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse(status_code=config["error_status"], content={"message": "mock failure"})
+    return await call_next(request)
+
+
+@app.get("/_mock/config")
+async def get_config():
+    return {**config, **stats, "documents": len(documents)}
+
+
+@app.put("/_mock/config")
+async def update_config(changes: Dict[str, Any]):
+    unknown = set(changes) - set(config)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown keys: {sorted(unknown)}")
+    config.update(changes)
+    return config
+
+
+@app.post("/api/auth")
+async def auth(payload: Dict[str, Any]):
+    if "signature" not in payload:
+        return {"nonce": uuid.uuid4().hex}
+    iin, surname, given_name = _identity(payload["signature"])
+    return {
+        "subject": f"CN={surname},GIVENNAME={given_name},SERIALNUMBER=IIN{iin},O=ТОО «Тест {iin[-3:]}»,C=KZ",
+        "userId": f"IIN{iin}",
+        "businessId": f"BIN{iin[::-1]}",
+    }
+
+
+@app.post("/api")
+async def register(payload: Dict[str, Any]):
+    document_id = uuid.uuid4().hex[:16]
+    documents[document_id] = {
+        "title": payload.get("title"),
+        "signatures": [_signature_entry(1, payload.get("signature"))],
+        "data_size": None,
+    }
+    return {"documentId": document_id, "signId": 1}
+
+
+def _document(document_id: str) -> Dict[str, Any]:
+    document = documents.get(document_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="document not found")
+    return document
+
+
+@app.post("/api/{document_id}/data")
+async def fix_hash(document_id: str, request: Request):
+    document = _document(document_id)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+    document["data_size"] = size
+    return {"documentId": document_id, "signedDataSize": size}
+
+
+@app.get("/api/{document_id}")
+async def get_document(document_id: str):
+    document = _document(document_id)
+    return {
+        "documentId": document_id,
+        "title": document["title"],
+        "signaturesTotal": len(document["signatures"]),
+        "signatures": document["signatures"],
+    }
+
+
+@app.post("/api/{document_id}")
+async def add_signature(document_id: str, payload: Dict[str, Any]):
+    document = _document(document_id)
+    sign_id = len(document["signatures"]) + 1
+    document["signatures"].append(_signature_entry(sign_id, payload.get("signature")))
+    return {"documentId": document_id, "signId": sign_id}
+
+
+@app.get("/api/{document_id}/signature/{sign_id}/qr")
+async def signature_qr(document_id: str, sign_id: int, signFormat: int = 0):
+    document = _document(document_id)
+    if not 1 <= sign_id <= len(document["signatures"]):
+        raise HTTPException(status_code=404, detail="signature not found")
+    return {
+        "documentId": document_id,
+        "signId": sign_id,
+        "signType": "cms",
+        "signFormat": signFormat,
+        "qrCodes": _qr_payload(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local SIGEX stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=config["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=config["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=config["error_rate"])
+    parser.add_argument("--error-status", type=int, default=config["error_status"])
+    parser.add_argument("--qr-codes", type=int, default=config["qr_codes"])
+    args = parser.parse_args()
+    config.update(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        qr_codes=args.qr_codes,
+    )
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from core.settings import settings
+from services.pdf_signature_service import PDFSignatureService
+
+from benchmarks.fixtures import make_document, make_signature_data
+from benchmarks.timing import summarize
+
+DEFAULT_PAGES = [1, 10, 50, 100, 500]
+DEFAULT_SIGNERS = [1, 3, 5]
+
+
+def bench_signature_page(pages_list, signers_list, repeat: int, mode: str | None = None) -> list:
+    """Times the work add_signature_page hands to the render pool.
+
+    Timings come from runs without tracemalloc; peak memory comes from one
+    extra traced run, because tracing slows the code it watches.
+    """
+    mode = mode or settings.PDF_APPEND_MODE
+    service = PDFSignatureService()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in pages_list:
+            source = os.path.join(tmp, f"source_{pages}.pdf")
+            make_document(source, pages)
+            for signers in signers_list:
+                signature_data = make_signature_data(signers)
+                target = os.path.join(tmp, f"target_{pages}_{signers}.pdf")
+                timings = []
+                for _ in range(repeat):
+                    shutil.copyfile(source, target)
+                    started = time.perf_counter()
+                    service.append_signature_page(target, signature_data, mode=mode)
+                    timings.append(time.perf_counter() - started)
+
+                shutil.copyfile(source, target)
+                tracemalloc.start()
+                service.append_signature_page(target, signature_data, mode=mode)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                results.append({
+                    "pages": pages,
+                    "signers": signers,
+                    "mode": mode,
+                    "source_bytes": os.path.getsize(source),
+                    "result_bytes": os.path.getsize(target),
+                    "peak_memory_bytes": peak,
+                    **summarize(timings),
+                })
+    return results
@@ -0,0 +1,21 @@
+import statistics
+from typing import Dict, List
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Milliseconds summary of a list of durations in seconds."""
+    ordered = sorted(timings)
+
+    def percentile(p: float) -> float:
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "min_ms": ordered[0] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": ordered[-1] * 1000,
+    }
@@ -0,0 +1,68 @@
+"""Per-stage breakdown of spans written with TRACING_EXPORTER=file::
+
+    python -m benchmarks.trace_report traces.jsonl [--root "POST /sign/addsign"]
+
+For every span name it prints count, p50/p95/p99 and the share of the root
+spans' total time, so the stages worth optimizing stand out. A registration
+job continues the upload request's trace but runs after the response, so
+break it down on its own with ``--root registration_job``.
+"""
+import argparse
+import json
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.timing import summarize
+
+
+def load(path: str) -> List[dict]:
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _descendants(spans: List[dict], root_ids: set) -> List[dict]:
+    children: Dict[str, List[dict]] = defaultdict(list)
+    for s in spans:
+        children[s["parent_id"]].append(s)
+    found, stack = [], list(root_ids)
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child["span_id"])
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize exported trace spans by stage")
+    parser.add_argument("path")
+    parser.add_argument("--root", help="only spans under root spans with this name (e.g. 'POST /sign/addsign')")
+    args = parser.parse_args()
+
+    spans = load(args.path)
+    if args.root:
+        roots = [s for s in spans if s["name"] == args.root]
+        spans = roots + _descendants(spans, {s["span_id"] for s in roots})
+    else:
+        roots = [s for s in spans if s["parent_id"] is None]
+    root_total = sum(s["duration_ms"] for s in roots) or 1.0
+
+    by_name: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for s in spans:
+        by_name[s["name"]].append(s["duration_ms"] / 1000)
+        if s.get("error"):
+            errors[s["name"]] += 1
+
+    print(f"{'span':<48} {'count':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'share':>7}")
+    rows = sorted(by_name.items(), key=lambda item: -sum(item[1]))
+    for name, durations in rows:
+        summary = summarize(durations)
+        share = sum(durations) * 1000 / root_total * 100
+        print(
+            f"{name:<48} {summary['count']:>6} {errors.get(name, 0):>4} {summary['p50_ms']:>8.1f} "
+            f"{summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f} {share:>6.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
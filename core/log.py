@@ -0,0 +1,93 @@
+from contextvars import ContextVar
+from typing import Any
+import copy
+import logging
+import logging.handlers
+import queue
+import sys
+from pythonjsonlogger.json import JsonFormatter
+from core.settings import settings
+from core.tracing import current_trace_id
+
+correlation_id: ContextVar[str | None] = ContextVar("correlation_id", default=None)
+document_id: ContextVar[str | None] = ContextVar("document_id", default=None)
+
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+_listener: logging.handlers.QueueListener | None = None
+_handler: logging.Handler | None = None
+
+
+def truncate(value: Any, limit: int | None = None) -> Any:
+    """Shortens long strings (QR codes, signatures) anywhere inside a log payload."""
+    limit = settings.LOG_MAX_FIELD_LENGTH if limit is None else limit
+    if isinstance(value, str):
+        if len(value) > limit:
+            return f"{value[:limit]}...<{len(value) - limit} more>"
+        return value
+    if isinstance(value, dict):
+        return {key: truncate(item, limit) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [truncate(item, limit) for item in value]
+    return value
+
+
+def bind_document(value: Any) -> None:
+    document_id.set(str(value) if value is not None else None)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # Runs on the caller's thread: only attach context and cut payloads down,
+    # the JSON encoding and the write happen on the listener thread.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = truncate(record.getMessage())
+        record.message = record.msg
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for key, value in list(vars(record).items()):
+            if key not in _STANDARD_ATTRS:
+                setattr(record, key, truncate(value))
+        record.correlation_id = correlation_id.get()
+        record.document_id = document_id.get()
+        record.trace_id = current_trace_id()
+        return record
+
+
+def _apply_levels() -> None:
+    logging.getLogger().setLevel(settings.LOG_LEVEL.upper())
+    for item in filter(None, (part.strip() for part in settings.LOG_LEVELS.split(","))):
+        name, _, level = item.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+
+def setup_logging() -> None:
+    """Sends every record through a queue to a background thread that writes JSON lines to stdout."""
+    global _listener, _handler
+    if _listener is not None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter(
+        "%(levelname)s %(name)s %(message)s",
+        rename_fields={"levelname": "level", "name": "logger"},
+        timestamp=True,
+        json_ensure_ascii=False,
+    ))
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+    _handler = _QueueHandler(log_queue)
+    logging.getLogger().addHandler(_handler)
+    _apply_levels()
+
+
+def stop_logging() -> None:
+    global _listener, _handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    _listener = None
+    _handler = None
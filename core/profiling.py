@@ -0,0 +1,156 @@
+"""Opt-in per-request profiling.
+
+A request is profiled when it carries a valid ``X-Profile-Signature`` header
+(HMAC of expiry, method and path with PROFILING_SECRET) or is picked by
+PROFILING_SAMPLE_RATE. The middleware is only installed when one of the two
+is configured. Generate a header with::
+
+    python -m core.profiling GET /documents/pending --ttl 600
+
+cProfile sees everything running on the event loop thread, so concurrent
+requests show up in the profile too, and only one request is profiled at a
+time; others are passed through.
+"""
+from contextvars import ContextVar
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import re
+import time
+from core.settings import settings
+
+PROFILE_HEADER = b"x-profile-signature"
+SLOWEST_STATEMENTS = 10
+STATEMENT_LENGTH = 1000
+
+logger = logging.getLogger(__name__)
+sql_stats: ContextVar[Dict[str, Any] | None] = ContextVar("sql_stats", default=None)
+
+
+def profiling_enabled() -> bool:
+    return bool(settings.PROFILING_SECRET) or settings.PROFILING_SAMPLE_RATE > 0
+
+
+def sign(method: str, path: str, expires: int, secret: str | None = None) -> str:
+    secret = settings.PROFILING_SECRET if secret is None else secret
+    message = f"{expires}:{method.upper()}:{path}".encode()
+    return f"{expires}.{hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()}"
+
+
+def verify(value: str, method: str, path: str) -> bool:
+    if not settings.PROFILING_SECRET:
+        return False
+    expires, _, _ = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(value, sign(method, path, int(expires)))
+
+
+def record_statement(statement: str, elapsed: float) -> None:
+    stats = sql_stats.get()
+    if stats is None:
+        return
+    stats["count"] += 1
+    stats["seconds"] += elapsed
+    slowest: List = stats["slowest"]
+    slowest.append((elapsed, statement[:STATEMENT_LENGTH]))
+    if len(slowest) > SLOWEST_STATEMENTS:
+        slowest.sort(reverse=True)
+        del slowest[SLOWEST_STATEMENTS:]
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", value).strip("_") or "root"
+
+
+def _dump(profiler: cProfile.Profile, report: Dict[str, Any]) -> str:
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    base = os.path.join(
+        settings.PROFILING_DIR,
+        f"{time.strftime('%Y%m%dT%H%M%S')}_{report['method']}_{_slug(report['route'])}_{report['duration_ms']:.0f}ms",
+    )
+    profiler.dump_stats(base + ".prof")
+    with open(base + ".json", "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    return base + ".prof"
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    def _wanted(self, scope) -> bool:
+        if self._busy:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return verify(value.decode("latin-1"), scope["method"], scope["path"])
+        return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        status = {"code": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        stats = {"count": 0, "seconds": 0.0, "slowest": []}
+        token = sql_stats.set(stats)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - started
+            sql_stats.reset(token)
+            self._busy = False
+            route = scope.get("route")
+            report = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", scope["path"]),
+                "status_code": status["code"],
+                "duration_ms": duration * 1000,
+                "sql_statements": stats["count"],
+                "sql_ms": stats["seconds"] * 1000,
+                "slowest_statements": [
+                    {"ms": elapsed * 1000, "statement": statement}
+                    for elapsed, statement in sorted(stats["slowest"], reverse=True)
+                ],
+            }
+            try:
+                path = await asyncio.to_thread(_dump, profiler, report)
+                logger.info("Request profiled", extra={"profile": path, "duration_ms": report["duration_ms"]})
+            except OSError as e:
+                logger.warning("Profile dump failed", extra={"error": repr(e)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print an X-Profile-Signature header value for one request")
+    parser.add_argument("method")
+    parser.add_argument("path")
+    parser.add_argument("--ttl", type=int, default=300, help="seconds the signature stays valid")
+    args = parser.parse_args()
+    if not settings.PROFILING_SECRET:
+        parser.error("PROFILING_SECRET is not set")
+    print(sign(args.method, args.path, int(time.time()) + args.ttl))
+
+
+if __name__ == "__main__":
+    main()
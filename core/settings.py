@@ -3,7 +3,57 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     AUTH_BASE_URL: str = "https://sigex.kz"
     AUTH_ENDPOINT_PATH: str = "/api/auth"
+    SIGEX_HTTP2: bool = False
+    SIGEX_MAX_CONNECTIONS: int = 100
+    SIGEX_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    SIGEX_KEEPALIVE_EXPIRY: float = 30.0
+    SIGEX_CONNECT_TIMEOUT: float = 5.0
+    SIGEX_READ_TIMEOUT: float = 30.0
+    SIGEX_WRITE_TIMEOUT: float = 30.0
+    SIGEX_POOL_TIMEOUT: float = 5.0
+    SIGEX_QR_CONCURRENCY: int = 5
+    SIGEX_QR_TIMEOUT: float = 10.0
+    SIGNATURE_CACHE_SIZE: int = 2048
+    SIGNATURE_CACHE_REDIS_URL: str | None = None
+    SIGNATURE_CACHE_TTL: int = 30 * 24 * 3600
     DATABASE_URL: str
+    DATABASE_READ_URL: str | None = None
+    READ_YOUR_WRITES_WINDOW: float = 5.0
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    PARTNER_SEARCH_THRESHOLD: float = 0.2
+    PARTNER_SEARCH_CACHE_SIZE: int = 1024
+    PARTNER_SEARCH_CACHE_TTL: float = 30.0
+    BLOB_STORAGE_DIR: str = "storage/blobs"
+    MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024
+    PDF_APPEND_MODE: str = "incremental"
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_QUEUE_SIZE: int = 32
+    PDF_RENDER_QUEUE_TIMEOUT: float = 30.0
+    PDF_LOCK_DIR: str = "storage/locks"
+    JOB_QUEUE_BACKEND: str = "inprocess"
+    JOB_QUEUE_WORKERS: int = 4
+    JOB_QUEUE_SIZE: int = 1000
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    REGISTRATION_MAX_ATTEMPTS: int = 3
+    REGISTRATION_RETRY_BACKOFF: float = 2.0
+    REGISTRATION_LEASE_SECONDS: int = 120
+    REGISTRATION_RECOVERY_INTERVAL: float = 60.0
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = "httpx=WARNING"
+    LOG_MAX_FIELD_LENGTH: int = 256
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_SERVICE_NAME: str = "docsign"
+    PROFILING_SECRET: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = "profiles"
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,244 @@
+from contextvars import ContextVar
+from typing import Any, Dict, List
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import httpx
+from core.settings import settings
+
+TRACEPARENT_HEADER = "traceparent"
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "attributes", "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, sampled: bool, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+        self._token = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set(self, **attributes: Any) -> None:
+        if self.sampled:
+            self.attributes.update(attributes)
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        if self.sampled and _exporter is not None:
+            _exporter.submit(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current.reset(self._token)
+        if exc is not None:
+            self.error = repr(exc)
+        self.end()
+        return False
+
+
+class _NoopSpan:
+    sampled = False
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Span | None] = ContextVar("trace_span", default=None)
+
+
+def start_trace(name: str, traceparent: str | None = None, **attributes: Any) -> Span | _NoopSpan:
+    """Root span of a request or job; continues the caller's trace when a valid traceparent is given."""
+    if _exporter is None:
+        return _NOOP
+    match = TRACEPARENT_PATTERN.match(traceparent or "")
+    if match:
+        trace_id, parent_id, sampled = match[1], match[2], bool(int(match[3], 16) & 1)
+    else:
+        trace_id, parent_id, sampled = os.urandom(16).hex(), None, random.random() < settings.TRACING_SAMPLE_RATIO
+    return Span(name, trace_id, parent_id, sampled, attributes)
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """Child of the current span; a no-op outside a sampled trace."""
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        return _NOOP
+    return Span(name, parent.trace_id, parent.span_id, True, attributes)
+
+
+def traced(name: str):
+    """Wraps an async function in a child span."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Span | _NoopSpan:
+    return _current.get() or _NOOP
+
+
+def current_trace_id() -> str | None:
+    current = _current.get()
+    return current.trace_id if current is not None else None
+
+
+def current_traceparent() -> str | None:
+    current = _current.get()
+    return current.traceparent if current is not None else None
+
+
+def _span_record(s: Span) -> Dict[str, Any]:
+    return {
+        "trace_id": s.trace_id,
+        "span_id": s.span_id,
+        "parent_id": s.parent_id,
+        "name": s.name,
+        "start_ns": s.start_ns,
+        "duration_ms": (s.end_ns - s.start_ns) / 1e6,
+        "attributes": s.attributes,
+        "error": s.error,
+    }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(s: Span) -> Dict[str, Any]:
+    attributes = [{"key": key, "value": _otlp_value(value)} for key, value in s.attributes.items()]
+    status = {"code": 1}
+    if s.error is not None:
+        status = {"code": 2, "message": s.error}
+    return {
+        "traceId": s.trace_id,
+        "spanId": s.span_id,
+        "parentSpanId": s.parent_id or "",
+        "name": s.name,
+        "kind": 1,
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": attributes,
+        "status": status,
+    }
+
+
+class _Exporter(threading.Thread):
+    """Collects finished spans from a queue and writes them in batches off the event loop."""
+
+    def __init__(self, kind: str):
+        super().__init__(name="trace-exporter", daemon=True)
+        self.kind = kind
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._http: httpx.Client | None = None
+
+    def submit(self, s: Span | None) -> None:
+        self.queue.put(s)
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Span] = []
+            item = self.queue.get()
+            deadline = time.monotonic() + EXPORT_INTERVAL
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= EXPORT_BATCH_SIZE:
+                    break
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self._export(batch)
+                except Exception as e:
+                    logger.warning("Trace export failed", extra={"spans": len(batch), "error": repr(e)})
+        if self._http is not None:
+            self._http.close()
+
+    def _export(self, batch: List[Span]) -> None:
+        if self.kind == "file":
+            with open(settings.TRACING_FILE, "a", encoding="utf-8") as fh:
+                fh.writelines(json.dumps(_span_record(s), ensure_ascii=False, default=str) + "\n" for s in batch)
+            return
+        if self._http is None:
+            self._http = httpx.Client(timeout=5.0)
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": settings.TRACING_SERVICE_NAME}},
+                ]},
+                "scopeSpans": [{"scope": {"name": "docsign"}, "spans": [_otlp_span(s) for s in batch]}],
+            }]
+        }
+        response = self._http.post(settings.TRACING_OTLP_ENDPOINT, json=payload)
+        response.raise_for_status()
+
+
+_exporter: _Exporter | None = None
+
+
+def setup_tracing() -> None:
+    global _exporter
+    if _exporter is not None or settings.TRACING_EXPORTER == "none":
+        return
+    if settings.TRACING_EXPORTER not in ("file", "otlp"):
+        raise ValueError(f"Unknown TRACING_EXPORTER: {settings.TRACING_EXPORTER}")
+    _exporter = _Exporter(settings.TRACING_EXPORTER)
+    _exporter.start()
+
+
+def shutdown_tracing() -> None:
+    global _exporter
+    if _exporter is None:
+        return
+    exporter, _exporter = _exporter, None
+    exporter.submit(None)
+    exporter.join(timeout=10)
@@ -1,6 +1,7 @@
 from datetime import datetime
+import uuid
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase
-from sqlalchemy import String, Integer, DateTime, UniqueConstraint, ForeignKey
+from sqlalchemy import String, Integer, DateTime, UniqueConstraint, ForeignKey, Index, BigInteger, Text, text
 from sqlalchemy.orm import relationship
 
 class Base(DeclarativeBase):
@@ -9,10 +10,20 @@ class Base(DeclarativeBase):
 def get_current_time():
     return datetime.utcnow()
 
+def generate_job_id():
+    return uuid.uuid4().hex
+
 class User(Base):
     __tablename__ = "users"
     __table_args__ = (
         UniqueConstraint("iin", name="uq_users_iin"),
+        Index("ix_users_full_name_trgm", text("f_unaccent(full_name) gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_users_organization_trgm", text("f_unaccent(organization) gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+        Index("ix_users_iin_trgm", "iin", postgresql_using="gin", postgresql_ops={"iin": "gin_trgm_ops"}),
+        Index("ix_users_iin_prefix", "iin", postgresql_ops={"iin": "varchar_pattern_ops"}),
+        Index("ix_users_bin_prefix", "bin", postgresql_ops={"bin": "varchar_pattern_ops"}),
+        Index("ix_users_bin_trgm", "bin", postgresql_using="gin", postgresql_ops={"bin": "gin_trgm_ops"}),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -25,6 +36,15 @@ class User(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=get_current_time, onupdate=get_current_time, nullable=False)
 
 
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    content_type: Mapped[str] = mapped_column(String(128), nullable=False, default="application/pdf")
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=get_current_time, nullable=False)
+
+
 class Document(Base):
     __tablename__ = "documents"
 
@@ -32,7 +52,7 @@ class Document(Base):
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     title: Mapped[str | None] = mapped_column(String(256), nullable=True)
     file_name: Mapped[str] = mapped_column(String(512), nullable=False)
-    file_base64: Mapped[str] = mapped_column(String, nullable=False)
+    blob_sha256: Mapped[str | None] = mapped_column(ForeignKey("blobs.sha256"), nullable=True, index=True)
     file_path: Mapped[str | None] = mapped_column(String(512), nullable=True)
     s_id: Mapped[str | None] = mapped_column(String(128), nullable=True, index=True)
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")
@@ -47,6 +67,10 @@ class Document(Base):
 
 class DocumentParticipant(Base):
     __tablename__ = "document_participants"
+    __table_args__ = (
+        # Serves the pending/signed listings: the participant filter, then the keyset.
+        Index("ix_document_participants_listing", "user_id", "status", "document_created_at", "document_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     document_id: Mapped[int] = mapped_column(ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -54,5 +78,22 @@ class DocumentParticipant(Base):
     role: Mapped[str] = mapped_column(String(32), nullable=False)  # initiator | signer
     status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")  # pending | signed
     signed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    document_created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # copy of documents.created_at
 
     document: Mapped["Document"] = relationship("Document", back_populates="participants")
+
+
+class RegistrationJob(Base):
+    __tablename__ = "registration_jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True, default=generate_job_id)
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True)
+    signature: Mapped[str] = mapped_column(Text, nullable=False)
+    participant_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default="queued", index=True)  # queued | running | succeeded | failed
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    s_id: Mapped[str | None] = mapped_column(String(128), nullable=True)  # SIGEX document id once registered
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=get_current_time, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=get_current_time, onupdate=get_current_time, nullable=False)
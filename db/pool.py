@@ -0,0 +1,128 @@
+from typing import Any, Dict
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from core.profiling import record_statement, sql_stats
+from core.tracing import span
+
+pool_stats: Dict[str, Dict[str, Any]] = {}
+STATEMENT_ATTRIBUTE_LENGTH = 500
+
+
+def _stats(name: str) -> Dict[str, Any]:
+    return pool_stats.setdefault(name, {
+        "connects": 0,
+        "checkouts": 0,
+        "checkins": 0,
+        "invalidations": 0,
+        "timeouts": 0,
+        "overflow_checkouts": 0,
+        "checkout_seconds_total": 0.0,
+        "checkout_seconds_max": 0.0,
+    })
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    # There is no pool event before a checkout starts waiting, so the wait is
+    # timed around _do_get; everything else comes from pool events.
+    def _do_get(self):
+        stats = _stats(self.logging_name or "default")
+        started = time.perf_counter()
+        try:
+            with span("db.checkout", engine=self.logging_name):
+                record = super()._do_get()
+        except exc.TimeoutError:
+            stats["timeouts"] += 1
+            raise
+        elapsed = time.perf_counter() - started
+        stats["checkout_seconds_total"] += elapsed
+        stats["checkout_seconds_max"] = max(stats["checkout_seconds_max"], elapsed)
+        if self.overflow() > 0:
+            stats["overflow_checkouts"] += 1
+        return record
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    stats = _stats(name)
+    target = engine.sync_engine
+
+    @event.listens_for(target, "connect")
+    def _connect(dbapi_connection, connection_record):
+        stats["connects"] += 1
+
+    @event.listens_for(target, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        stats["checkouts"] += 1
+
+    @event.listens_for(target, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        stats["checkins"] += 1
+
+    @event.listens_for(target, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        stats["invalidations"] += 1
+
+
+def trace_statements(engine: AsyncEngine, name: str) -> None:
+    target = engine.sync_engine
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        s = span("db.query", engine=name, statement=statement[:STATEMENT_ATTRIBUTE_LENGTH], executemany=executemany)
+        if s.sampled:
+            conn.info.setdefault("trace_spans", []).append(s)
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            s = spans.pop()
+            s.set(rowcount=cursor.rowcount)
+            s.end()
+
+    @event.listens_for(target, "handle_error")
+    def _error(context):
+        spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+        if spans:
+            s = spans.pop()
+            s.error = repr(context.original_exception)
+            s.end()
+
+
+def profile_statements(engine: AsyncEngine) -> None:
+    target = engine.sync_engine
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if sql_stats.get() is not None:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("profile_started")
+        if started:
+            record_statement(statement, time.perf_counter() - started.pop())
+
+    @event.listens_for(target, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("profile_started") if context.connection is not None else None
+        if started:
+            record_statement(context.statement or "", time.perf_counter() - started.pop())
+
+
+def engine_pool_status(engine: AsyncEngine, name: str) -> Dict[str, Any]:
+    pool = engine.pool
+    stats = _stats(name)
+    status = {**stats}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    status["checkout_seconds_avg"] = (
+        stats["checkout_seconds_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    )
+    return status
@@ -1,11 +1,82 @@
+from typing import Any, AsyncIterator, Dict
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy import text
+from fastapi import Request
+import itertools
+import time
 from core.settings import settings
+from core.profiling import profiling_enabled
 from db.models import Base
+from db.pool import InstrumentedQueuePool, instrument_engine, trace_statements, profile_statements, engine_pool_status
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
+WRITE_COOKIE = "db_write_at"
+
+
+
+def _create_engine(url: str, name: str):
+    e = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_logging_name=name,
+        connect_args={"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE},
+    )
+    instrument_engine(e, name)
+    trace_statements(e, name)
+    if profiling_enabled():
+        profile_statements(e)
+    return e
+
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+read_engines = [
+    _create_engine(url.strip(), f"replica{i}")
+    for i, url in enumerate(u for u in (settings.DATABASE_READ_URL or "").split(",") if u.strip())
+]
+_read_sessions = itertools.cycle(
+    [async_sessionmaker(e, expire_on_commit=False, class_=AsyncSession) for e in read_engines]
+    or [SessionLocal]
+)
+
+
+def pool_status() -> Dict[str, Dict[str, Any]]:
+    status = {"primary": engine_pool_status(engine, "primary")}
+    for i, e in enumerate(read_engines):
+        status[f"replica{i}"] = engine_pool_status(e, f"replica{i}")
+    return status
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    # AsyncSession only checks out a connection on its first statement, so
+    # handlers that never touch the database never hold a pooled connection.
+    async with SessionLocal() as session:
+        yield session
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        written_at = float(request.cookies.get(WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - written_at < settings.READ_YOUR_WRITES_WINDOW
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    # Replicas lag behind the primary, so a client that has just written
+    # keeps reading from the primary until the window runs out.
+    factory = SessionLocal if wrote_recently(request) else next(_read_sessions)
+    async with factory() as session:
+        yield session
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
         try:
@@ -16,4 +87,10 @@ async def init_db() -> None:
             await conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent;"))
         except Exception:
             pass
+        # unaccent() is only STABLE, so trigram indexes go through an IMMUTABLE wrapper.
+        await conn.execute(text(
+            "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+            "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+            "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;"
+        ))
         await conn.run_sync(Base.metadata.create_all)
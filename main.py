@@ -1,8 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from prometheus_fastapi_instrumentator import Instrumentator
 import os
+import re
+import time
+import uuid
 from routers.auth import router as auth_router
 from routers.user import router as user_router
 from routers.documents import router as documents_router
@@ -10,9 +15,86 @@ from routers.pending_documents import router as pending_documents_router
 from routers.signed_documents import router as signed_documents_router
 from routers.sign import router as sign_router
 
-from db.session import init_db
+from db.session import init_db, WRITE_COOKIE
+from services.sigex_client import open_client, close_client
+from services.signature_cache import signature_cache
+from services.pdf_render_pool import start_pool, shutdown_pool
+from services.job_queue import start_workers, stop_workers
+from core.log import setup_logging, stop_logging, correlation_id
+from core.profiling import ProfilingMiddleware, profiling_enabled
+from core.tracing import setup_tracing, shutdown_tracing, start_trace, TRACEPARENT_HEADER
+from core.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    setup_tracing()
+    await init_db()
+    await open_client()
+    start_pool()
+    await start_workers()
+    try:
+        yield
+    finally:
+        await stop_workers()
+        await close_client()
+        await signature_cache.close()
+        shutdown_pool()
+        shutdown_tracing()
+        stop_logging()
+
+
+app = FastAPI(title="DocSign - Подписание PDF документов", lifespan=lifespan)
+Instrumentator(excluded_handlers=["/metrics", "/static"]).instrument(app).expose(app, include_in_schema=False)
+
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+@app.middleware("http")
+async def mark_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in UNSAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            key=WRITE_COOKIE,
+            value=f"{time.time():.3f}",
+            max_age=max(int(settings.READ_YOUR_WRITES_WINDOW), 1),
+            httponly=True,
+            samesite="lax",
+            path="/",
+        )
+    return response
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+UNTRACED_PREFIXES = ("/metrics", "/static")
+
+
+@app.middleware("http")
+async def bind_request_context(request: Request, call_next):
+    request_id = request.headers.get(REQUEST_ID_HEADER, "")
+    if not REQUEST_ID_PATTERN.match(request_id):
+        request_id = uuid.uuid4().hex
+    correlation_id.set(request_id)
+    if request.url.path.startswith(UNTRACED_PREFIXES):
+        response = await call_next(request)
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+    with start_trace(f"{request.method} {request.url.path}", request.headers.get(TRACEPARENT_HEADER)) as root:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if root.sampled:
+            root.name = f"{request.method} {getattr(route, 'path', request.url.path)}"
+            root.set(status_code=response.status_code, request_id=request_id)
+            response.headers[TRACEPARENT_HEADER] = root.traceparent
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
 
-app = FastAPI(title="DocSign - Подписание PDF документов")
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
@@ -28,10 +110,6 @@ app.include_router(pending_documents_router)
 app.include_router(signed_documents_router)
 app.include_router(sign_router)
 
-@app.on_event("startup")
-async def on_startup():
-    await init_db()
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,14 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import JSONResponse
-import httpx
 from urllib.parse import urljoin
 from core.settings import settings
 from pydantic import BaseModel
 from services.auth_service import authenticate
+from services.sigex_client import get_client
+from services.partner_search_cache import partner_search_cache
 import re
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from db.session import SessionLocal
+from db.session import get_session
 from db.models import User
 
 router = APIRouter(prefix="", tags=["auth"])
@@ -36,9 +37,6 @@ def normalize_name(s: str):
         return None
     return " ".join([w.capitalize() for w in s.split()])
 
-async def get_session() -> AsyncSession:
-    async with SessionLocal() as session:
-        yield session
 
 @router.post("/get")
 async def get_nonce():
@@ -49,17 +47,17 @@ async def get_nonce():
         "Content-Type": "application/json"
     }
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(full_url, headers=headers, json={})
-            if response.status_code == 200:
-                nonce = response.json().get("nonce")
-                # print(nonce)
-                return JSONResponse(content={"nonce": nonce})
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Ошибка при получении nonce: {response.text}"
-                )
+        client = get_client()
+        response = await client.post(full_url, headers=headers, json={}, extensions={"sigex_call": "nonce"})
+        if response.status_code == 200:
+            nonce = response.json().get("nonce")
+            # print(nonce)
+            return JSONResponse(content={"nonce": nonce})
+        else:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Ошибка при получении nonce: {response.text}"
+            )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -90,11 +88,13 @@ async def check_signature(payload: CheckPayload, session: AsyncSession = Depends
         session.add(user)
         await session.commit()
         await session.refresh(user)
-    else:
+        partner_search_cache.invalidate()
+    elif (user.bin, user.full_name, user.organization) != (bin_value, full_name, organization):
         user.bin = bin_value
         user.full_name = full_name
         user.organization = organization
         await session.commit()
+        partner_search_cache.invalidate()
     resp = JSONResponse(content={"user_id": user.id})
     resp.set_cookie(key="uid", value=str(user.id), httponly=True, samesite="lax", path="/")
     return resp
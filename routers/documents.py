@@ -1,64 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Cookie
+from fastapi import APIRouter, Depends, HTTPException, Query, Cookie, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func
-from db.session import SessionLocal
-from db.models import User, Document, DocumentParticipant
+from sqlalchemy import select, insert, or_, func
+from db.session import get_session, get_read_session
+from db.models import User, Document, DocumentParticipant, RegistrationJob
 from pydantic import BaseModel, Field
 from typing import List
-from services.registration_service import register_document
+from services.job_queue import enqueue_registration
+from services.registration_job_service import fail_registration_job
+from services.blob_service import store_blob, store_blob_file
+from services.partner_search_cache import partner_search_cache, normalize_query
+from services.metrics import DOCUMENTS_CREATED
+from services.upload_service import (
+    parse_document_upload,
+    discard_upload,
+    UploadError,
+    UploadTooLargeError,
+    MAX_FIELD_SIZE,
+)
+from core.log import bind_document
+from core.settings import settings
+import asyncio
+import base64
+import binascii
+import logging
+import re
 
 
 router = APIRouter(prefix="/documents", tags=["documents"])
+logger = logging.getLogger(__name__)
 
-async def get_session() -> AsyncSession:
-    async with SessionLocal() as session:
-        yield session
 
+IDENTIFIER_LENGTH = 12
+DIGITS_PATTERN = re.compile(r"^[0-9]+$")
+EMAIL_PATTERN = re.compile(r"^[^\s@]+@[^\s@]*$")
 
-@router.get("/partners")
-async def search_partners(
-    q: str = Query(..., min_length=2, alias="query"),
-    limit: int = Query(10, ge=1, le=50),
-    uid: int | None = Cookie(default=None),
-    session: AsyncSession = Depends(get_session),
-):
-    qv = q.strip()
-    sim_full = func.similarity(User.full_name, qv)
-    sim_org = func.similarity(User.organization, qv)
-    sim_email = func.similarity(User.email, qv)
-    sim_iin = func.similarity(User.iin, qv)
-    sim_bin = func.similarity(User.bin, qv)
-
-    stmt = (
+
+def _classify_partner_query(qv: str) -> str:
+    if DIGITS_PATTERN.match(qv):
+        return "identifier"
+    if EMAIL_PATTERN.match(qv):
+        return "email"
+    return "text"
+
+
+def _like_prefix(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _identifier_search(qv: str, limit: int):
+    columns = select(User.id, User.iin, User.bin, User.full_name, User.organization, User.email)
+    if len(qv) == IDENTIFIER_LENGTH:
+        return columns.where(or_(User.iin == qv, User.bin == qv)).order_by(User.id).limit(limit)
+    return (
+        columns
+        .where(or_(User.iin.like(qv + "%"), User.bin.like(qv + "%")))
+        .order_by(User.iin)
+        .limit(limit)
+    )
+
+
+def _email_search(qv: str, limit: int):
+    return (
+        select(User.id, User.iin, User.bin, User.full_name, User.organization, User.email)
+        .where(User.email.ilike(_like_prefix(qv), escape="\\"))
+        .order_by(func.length(User.email), User.email)
+        .limit(limit)
+    )
+
+
+def _text_search(qv: str, limit: int):
+    needle = func.f_unaccent(qv)
+    full_name = func.f_unaccent(User.full_name)
+    organization = func.f_unaccent(User.organization)
+    return (
         select(User.id, User.iin, User.bin, User.full_name, User.organization, User.email)
         .where(
             or_(
-                sim_full > 0.2,
-                sim_org > 0.2,
-                sim_email > 0.2,
-                sim_iin > 0.2,
-                sim_bin > 0.2,
+                full_name.op("%")(needle),
+                organization.op("%")(needle),
+                User.email.op("%")(qv),
+                User.iin.op("%")(qv),
+                User.bin.op("%")(qv),
             )
         )
-        .order_by(func.greatest(sim_full, sim_org, sim_email, sim_iin, sim_bin).desc())
+        .order_by(
+            func.greatest(
+                func.similarity(full_name, needle),
+                func.similarity(organization, needle),
+                func.similarity(User.email, qv),
+                func.similarity(User.iin, qv),
+                func.similarity(User.bin, qv),
+            ).desc()
+        )
         .limit(limit)
     )
-    res = await session.execute(stmt)
-    rows = res.all()
-    items = []
-    for row in rows:
-        item = {
-            "id": row.id,
-            "iin": row.iin,
-            "bin": row.bin,
-            "full_name": row.full_name,
-            "organization": row.organization,
-            "email": row.email,
-        }
-        if uid is not None and row.id == uid:
-            continue
-        items.append(item)
+
+
+@router.get("/partners")
+async def search_partners(
+    q: str = Query(..., min_length=2, alias="query"),
+    limit: int = Query(10, ge=1, le=50),
+    uid: int | None = Cookie(default=None),
+    session: AsyncSession = Depends(get_read_session),
+):
+    qv = normalize_query(q)
+    items = partner_search_cache.get(qv, limit)
+    if items is None:
+        kind = _classify_partner_query(qv)
+        if kind == "identifier":
+            stmt = _identifier_search(qv, limit)
+        elif kind == "email":
+            stmt = _email_search(qv, limit)
+        else:
+            # `%` compares against pg_trgm.similarity_threshold and, unlike
+            # similarity(...) > x, can be answered from the GIN trigram indexes.
+            await session.execute(
+                select(func.set_config("pg_trgm.similarity_threshold", str(settings.PARTNER_SEARCH_THRESHOLD), True))
+            )
+            stmt = _text_search(qv, limit)
+
+        res = await session.execute(stmt)
+        items = [
+            {
+                "id": row.id,
+                "iin": row.iin,
+                "bin": row.bin,
+                "full_name": row.full_name,
+                "organization": row.organization,
+                "email": row.email,
+            }
+            for row in res.all()
+        ]
+        partner_search_cache.set(qv, limit, items)
+
+    if uid is not None:
+        items = [item for item in items if item["id"] != uid]
     return {"results": items}
 
 
@@ -70,17 +147,13 @@ class CreateDocumentPayload(BaseModel):
     participant_user_ids: List[int] = Field(default_factory=list)
 
 
-@router.post("")
-async def create_document(
-    payload: CreateDocumentPayload,
-    uid: int | None = Cookie(default=None),
-    session: AsyncSession = Depends(get_session),
-):
-    if uid is None:
-        raise HTTPException(status_code=401, detail="unauthorized")
-    
-    
-    unique_partners = list(dict.fromkeys([pid for pid in payload.participant_user_ids if pid != uid]))
+async def _check_participants(
+    session: AsyncSession,
+    uid: int,
+    participant_user_ids: List[int],
+    signature: str | None,
+) -> List[int]:
+    unique_partners = list(dict.fromkeys([pid for pid in participant_user_ids if pid != uid]))
     if len(unique_partners) > 4:
         raise HTTPException(status_code=400, detail="max 4 partners allowed")
 
@@ -91,65 +164,195 @@ async def create_document(
     if missing:
         raise HTTPException(status_code=400, detail=f"unknown user ids: {sorted(list(missing))}")
 
-    if not payload.signature:
+    if not signature:
         raise HTTPException(status_code=400, detail="signature is required for document registration")
 
+    return unique_partners
 
-    doc = Document(
-        owner_id=uid,
-        title=payload.title,
-        file_name=payload.file_name,
-        file_base64=payload.file_base64,
-        file_path="",
-        status="pending",
-    )
-    session.add(doc)
-    await session.flush()
-    
-    
-    initiator_part = DocumentParticipant(
-        document_id=doc.id,
-        user_id=uid,
-        role="initiator",
-        status="pending",
+
+async def _create_document(
+    session: AsyncSession,
+    uid: int,
+    title: str | None,
+    file_name: str,
+    signature: str,
+    participant_user_ids: List[int],
+    unique_partners: List[int],
+    blob_sha256: str,
+):
+    doc = (await session.execute(
+        insert(Document)
+        .values(
+            owner_id=uid,
+            title=title,
+            file_name=file_name,
+            blob_sha256=blob_sha256,
+            file_path="",
+            status="registering",
+        )
+        .returning(Document.id, Document.created_at)
+    )).one()
+    doc_id = doc.id
+
+    participants = [{"user_id": uid, "role": "initiator"}]
+    participants += [{"user_id": pid, "role": "signer"} for pid in unique_partners]
+    for participant in participants:
+        participant.update(document_id=doc_id, document_created_at=doc.created_at, status="pending")
+    await session.execute(insert(DocumentParticipant).values(participants))
+
+    job = (await session.execute(
+        insert(RegistrationJob)
+        .values(
+            document_id=doc_id,
+            signature=signature,
+            participant_count=len(participant_user_ids),
+            status="queued",
+        )
+        .returning(RegistrationJob.id, RegistrationJob.status)
+    )).one()
+    await session.commit()
+    DOCUMENTS_CREATED.inc()
+    bind_document(doc_id)
+    logger.info("Registration job queued", extra={"job_id": job.id})
+
+    try:
+        await enqueue_registration(job.id)
+    except asyncio.QueueFull:
+        # The job row is committed and stays queued; recovery runs it once the queue drains.
+        logger.warning("Job queue full, registration deferred", extra={"job_id": job.id})
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "message": "registration queue is full, the job will be run later",
+                "job_id": job.id,
+                "status_url": f"/documents/jobs/{job.id}",
+            },
+            headers={"Retry-After": str(int(settings.REGISTRATION_RECOVERY_INTERVAL))},
+        )
+    except Exception as e:
+        await fail_registration_job(job.id, doc_id, f"Enqueue failed: {e!r}", 0)
+        raise HTTPException(status_code=503, detail="registration queue is unavailable")
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "document_id": doc_id,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/documents/jobs/{job.id}",
+        },
     )
-    session.add(initiator_part)
-    
-
-    
-    for pid in unique_partners:
-        participant = DocumentParticipant(
-            document_id=doc.id,
-            user_id=pid,
-            role="signer",
-            status="pending",
+
+
+@router.get("/jobs/{job_id}")
+async def get_registration_job(
+    job_id: str,
+    uid: int | None = Cookie(default=None),
+    session: AsyncSession = Depends(get_session),
+):
+    if uid is None:
+        raise HTTPException(status_code=401, detail="unauthorized")
+    res = await session.execute(
+        select(
+            RegistrationJob.id,
+            RegistrationJob.document_id,
+            RegistrationJob.status,
+            RegistrationJob.attempts,
+            RegistrationJob.error,
         )
-        session.add(participant)
-        
+        .join(Document, Document.id == RegistrationJob.document_id)
+        .where(RegistrationJob.id == job_id, Document.owner_id == uid)
+    )
+    job = res.one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return {
+        "job_id": job.id,
+        "document_id": job.document_id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+    }
 
-    await session.flush()
-    
-   
-    check_stmt = select(DocumentParticipant).where(DocumentParticipant.document_id == doc.id)
-    check_result = await session.execute(check_stmt)
-    participants = check_result.scalars().all()
-    
-    
-    registration_result = await register_document(
-        title=payload.title or payload.file_name,
-        file_base64=payload.file_base64,
+
+@router.post("")
+async def create_document(
+    payload: CreateDocumentPayload,
+    uid: int | None = Cookie(default=None),
+    session: AsyncSession = Depends(get_session),
+):
+    if uid is None:
+        raise HTTPException(status_code=401, detail="unauthorized")
+
+    try:
+        file_content = base64.b64decode(payload.file_base64, validate=True)
+    except binascii.Error:
+        raise HTTPException(status_code=400, detail="file_base64 is not valid base64")
+
+    unique_partners = await _check_participants(session, uid, payload.participant_user_ids, payload.signature)
+    blob_sha256 = await store_blob(session, file_content)
+
+    return await _create_document(
+        session,
+        uid,
+        title=payload.title,
+        file_name=payload.file_name,
         signature=payload.signature,
-        participant_count=len(payload.participant_user_ids),
-        session=session,
-        o_doc_id=doc.id
+        participant_user_ids=payload.participant_user_ids,
+        unique_partners=unique_partners,
+        blob_sha256=blob_sha256,
     )
 
-    if not registration_result["success"]:
-        await session.rollback()
-        raise HTTPException(status_code=500, detail=f"Document registration failed: {registration_result['error']}")
 
-    doc.file_path = registration_result["file_path"]
-    doc.s_id = registration_result["document_id"]
-    await session.commit()
+@router.post("/upload")
+async def upload_document(
+    request: Request,
+    uid: int | None = Cookie(default=None),
+    session: AsyncSession = Depends(get_session),
+):
+    if uid is None:
+        raise HTTPException(status_code=401, detail="unauthorized")
+
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="multipart/form-data expected")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_SIZE + MAX_FIELD_SIZE:
+        raise HTTPException(status_code=413, detail="file is too large")
 
-    return {"document_id": doc.id}
\ No newline at end of file
+    try:
+        parsed = await parse_document_upload(request.stream(), content_type, settings.MAX_UPLOAD_SIZE)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="file is too large")
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    upload = parsed["file"]
+    fields = parsed["fields"]
+    try:
+        try:
+            participant_user_ids = [int(v) for v in fields.get("participant_user_ids", []) if v]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="participant_user_ids must be integers")
+
+        file_name = (fields.get("file_name") or [upload["filename"]])[0]
+        if not file_name:
+            raise HTTPException(status_code=400, detail="file_name is required")
+
+        signature = (fields.get("signature") or [None])[0]
+        unique_partners = await _check_participants(session, uid, participant_user_ids, signature)
+        blob_sha256 = await store_blob_file(session, upload["path"], upload["sha256"], upload["size"])
+
+        return await _create_document(
+            session,
+            uid,
+            title=(fields.get("title") or [None])[0],
+            file_name=file_name,
+            signature=signature,
+            participant_user_ids=participant_user_ids,
+            unique_partners=unique_partners,
+            blob_sha256=blob_sha256,
+        )
+    finally:
+        discard_upload(upload)
@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, Cookie, HTTPException
+from fastapi import APIRouter, Depends, Cookie, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from db.session import SessionLocal
-from services.document_service import get_pending_documents
+from db.session import get_read_session
+from services.document_service import (
+    get_pending_documents,
+    InvalidCursorError,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+)
 from typing import Dict, List, Any
 
 router = APIRouter(prefix="/documents/pending", tags=["documents"])
 
-async def get_session() -> AsyncSession:
-    async with SessionLocal() as session:
-        yield session
-
 @router.get("")
 async def get_pending(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
     uid: int | None = Cookie(default=None),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     if not uid:
         raise HTTPException(status_code=401, detail="unauthorized")
     
-    documents = await get_pending_documents(session, uid)
-    return {"documents": documents}
\ No newline at end of file
+    try:
+        return await get_pending_documents(session, uid, limit=limit, cursor=cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
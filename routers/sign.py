@@ -1,37 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException, Cookie, Query
+from fastapi import APIRouter, Depends, HTTPException, Cookie, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from db.session import SessionLocal
-from db.models import Document, User, DocumentParticipant
+from db.session import get_session, get_read_session
+from db.models import Blob, Document, User, DocumentParticipant
 from services.signature_service import add_signature
 from services.pdf_signature_service import PDFSignatureService
+from services.pdf_render_pool import PdfRenderQueueFull
 from services.participant_status_update_service import update_participants_status
+from services.blob_service import iter_blob
+from services.metrics import SIGNATURES_APPLIED
+from core.log import bind_document
+from typing import Tuple
+import logging
+import re
 
 router = APIRouter(prefix="/sign", tags=["sign"])
+logger = logging.getLogger(__name__)
 
-async def get_session() -> AsyncSession:
-    async with SessionLocal() as session:
-        yield session
 
-@router.get("/getbase64")
-async def get_base64(
-    document_id: int = Query(...),
+BLOB_CACHE_CONTROL = "private, max-age=31536000, immutable"
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _parse_range(range_header: str, size: int) -> Tuple[int, int] | None:
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start_s, _, end_s = spec.strip().partition("-")
+    try:
+        if start_s:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+        else:
+            start = max(size - int(end_s), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end:
+        raise HTTPException(status_code=416, detail="range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+@router.get("/file/{sha256}")
+async def get_file(
+    sha256: str,
+    request: Request,
     uid: int | None = Cookie(default=None),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     if uid is None:
         raise HTTPException(status_code=401, detail="unauthorized")
-    res = await session.execute(select(Document).where(Document.id == document_id))
-    doc = res.scalar_one_or_none()
-    if doc is None:
+    if not SHA256_PATTERN.match(sha256):
         raise HTTPException(status_code=404, detail="document not found")
-    return {"document_id": doc.id, "file_base64": doc.file_base64}
+
+    res = await session.execute(
+        select(Blob.size, Blob.content_type)
+        .join(Document, Document.blob_sha256 == Blob.sha256)
+        .join(DocumentParticipant, DocumentParticipant.document_id == Document.id)
+        .where(Blob.sha256 == sha256, DocumentParticipant.user_id == uid)
+        .limit(1)
+    )
+    row = res.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="document not found")
+
+    etag = f'"{sha256}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": BLOB_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = _parse_range(range_header, row.size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(row.size)
+        return StreamingResponse(iter_blob(sha256), media_type=row.content_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{row.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_blob(sha256, start, end),
+        status_code=206,
+        media_type=row.content_type,
+        headers=headers,
+    )
 
 
 class AddSignPayload(BaseModel):
     document_id: int
-    file_base64: str
+    file_base64: str | None = None
     signature: str
 
 @router.post("/addsign")
@@ -42,13 +111,18 @@ async def add_sign(
 ):
     if uid is None:
         raise HTTPException(status_code=401, detail="unauthorized")
+    bind_document(payload.document_id)
     
-    res = await session.execute(select(Document).where(Document.id == payload.document_id))
-    doc = res.scalar_one_or_none()
+    res = await session.execute(
+        select(Document.id, Document.s_id, Document.file_path).where(Document.id == payload.document_id)
+    )
+    doc = res.one_or_none()
     if doc is None:
         raise HTTPException(status_code=404, detail="document not found")
-    if not getattr(doc, "s_id", None):
+    if not doc.s_id:
         raise HTTPException(status_code=400, detail="document has no external id")
+    # End the read transaction so no connection is held while SIGEX is called.
+    await session.rollback()
     
     service_result = await add_signature(doc.s_id, payload.signature)
     
@@ -74,14 +148,22 @@ async def add_sign(
                 "total_signatures": len(filtered_signatures),
                 "signatures": filtered_signatures
             }
-            print("filtered_signature_details", filtered_signature_details)
+            logger.info(
+                "Applying new signatures",
+                extra={"iins": [sig["iin"] for sig in filtered_signatures], "sign_ids": [sig["sign_id"] for sig in filtered_signatures]},
+            )
+            await session.rollback()
             pdf_service = PDFSignatureService()
-            await pdf_service.add_signature_page(doc.file_path, filtered_signature_details)
+            try:
+                await pdf_service.add_signature_page(doc.file_path, filtered_signature_details)
+            except PdfRenderQueueFull:
+                raise HTTPException(status_code=503, detail="signature page queue is full, retry later")
 
-            await update_participants_status(
+            signed_ids = await update_participants_status(
                 session=session,
                 o_doc_id=payload.document_id,
                 signature_data=filtered_signature_details
             )
+            SIGNATURES_APPLIED.inc(len(signed_ids))
     
     return {"document_id": doc.id}
\ No newline at end of file
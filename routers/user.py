@@ -3,8 +3,9 @@ from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from db.session import SessionLocal
+from db.session import get_session
 from db.models import User
+from services.partner_search_cache import partner_search_cache
 from datetime import datetime
 import pytz
 from pydantic import BaseModel, EmailStr
@@ -12,9 +13,6 @@ from pydantic import BaseModel, EmailStr
 router = APIRouter(prefix="/user", tags=["user"])
 templates = Jinja2Templates(directory="templates")
 
-async def get_session() -> AsyncSession:
-    async with SessionLocal() as session:
-        yield session
 
 def format_datetime(dt: datetime, timezone_name: str = "Asia/Almaty") -> str:
     if not dt:
@@ -60,8 +58,10 @@ async def set_email(payload: EmailPayload, uid: int | None = Cookie(default=None
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
-    user.email = payload.email
-    await session.commit()
+    if user.email != payload.email:
+        user.email = payload.email
+        await session.commit()
+        partner_search_cache.invalidate()
     return {"status": "ok"}
 
 @router.get("/logout")
@@ -3,6 +3,7 @@ from urllib.parse import urljoin
 import httpx
 from fastapi import HTTPException
 from core.settings import settings
+from services.sigex_client import get_client
 
 async def authenticate(nonce: str, signature: str) -> Dict[str, Any]:
     base_url = settings.AUTH_BASE_URL.rstrip("/") + "/"
@@ -19,14 +20,14 @@ async def authenticate(nonce: str, signature: str) -> Dict[str, Any]:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(full_url, json=payload, headers=headers)
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Ошибка аутентификации: {response.text}"
-                )
-            return response.json()
+        client = get_client()
+        response = await client.post(full_url, json=payload, headers=headers, extensions={"sigex_call": "auth"})
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Ошибка аутентификации: {response.text}"
+            )
+        return response.json()
     except httpx.HTTPStatusError as exc:
         raise HTTPException(
             status_code=exc.response.status_code,
@@ -0,0 +1,83 @@
+from typing import AsyncIterator, Tuple
+import asyncio
+import hashlib
+import os
+import tempfile
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from core.settings import settings
+from db.models import Blob
+
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(settings.BLOB_STORAGE_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def write_blob(data: bytes) -> Tuple[str, int]:
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = blob_path(sha256)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return sha256, len(data)
+
+
+def move_blob_file(tmp_path: str, sha256: str) -> None:
+    path = blob_path(sha256)
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+
+
+def read_blob(sha256: str) -> bytes:
+    with open(blob_path(sha256), "rb") as f:
+        return f.read()
+
+
+async def iter_blob(sha256: str, start: int = 0, end: int | None = None, chunk_size: int = 256 * 1024) -> AsyncIterator[bytes]:
+    with open(blob_path(sha256), "rb") as f:
+        f.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            chunk = await asyncio.to_thread(f.read, size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+async def register_blob(session: AsyncSession, sha256: str, size: int, content_type: str = "application/pdf") -> str:
+    await session.execute(
+        insert(Blob)
+        .values(sha256=sha256, size=size, content_type=content_type)
+        .on_conflict_do_nothing(index_elements=[Blob.sha256])
+    )
+    return sha256
+
+
+async def store_blob(session: AsyncSession, data: bytes, content_type: str = "application/pdf") -> str:
+    sha256, size = await asyncio.to_thread(write_blob, data)
+    return await register_blob(session, sha256, size, content_type)
+
+
+async def store_blob_file(
+    session: AsyncSession,
+    tmp_path: str,
+    sha256: str,
+    size: int,
+    content_type: str = "application/pdf",
+) -> str:
+    await asyncio.to_thread(move_blob_file, tmp_path, sha256)
+    return await register_blob(session, sha256, size, content_type)
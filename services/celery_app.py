@@ -0,0 +1,69 @@
+from typing import Any, Dict
+import asyncio
+from celery import Celery
+from celery.signals import setup_logging as celery_setup_logging
+from celery.signals import worker_process_shutdown
+from core.log import setup_logging
+from core.tracing import setup_tracing, shutdown_tracing
+from core.settings import settings
+
+celery_app = Celery("docsign", broker=settings.CELERY_BROKER_URL)
+celery_app.conf.task_acks_late = True
+# Run `celery -A services.celery_app beat` alongside the workers for job recovery.
+celery_app.conf.beat_schedule = {
+    "recover-registration-jobs": {
+        "task": "docsign.recover_registration_jobs",
+        "schedule": settings.REGISTRATION_RECOVERY_INTERVAL,
+    },
+}
+
+
+@celery_setup_logging.connect
+def _setup_logging(**kwargs) -> None:
+    setup_logging()
+
+
+@worker_process_shutdown.connect
+def _stop_tracing(**kwargs) -> None:
+    shutdown_tracing()
+
+
+async def _run(job_id: str, context: Dict[str, Any] | None) -> None:
+    from db.session import engine
+    from services.registration_job_service import run_registration_job
+    from services.sigex_client import close_client
+    from services.signature_cache import signature_cache
+    from services.pdf_render_pool import render_inline, shutdown_pool
+
+    setup_tracing()
+    render_inline()
+    try:
+        await run_registration_job(job_id, context)
+    finally:
+        await close_client()
+        await signature_cache.close()
+        await engine.dispose()
+        shutdown_pool()
+
+
+@celery_app.task(name="docsign.register_document")
+def run_registration_task(job_id: str, context: Dict[str, Any] | None = None) -> None:
+    asyncio.run(_run(job_id, context))
+
+
+async def _recover() -> None:
+    from db.session import engine
+    from services.registration_job_service import recover_stale_jobs
+
+    try:
+        job_ids = await recover_stale_jobs()
+    finally:
+        await engine.dispose()
+    for job_id in job_ids:
+        run_registration_task.delay(job_id)
+
+
+@celery_app.task(name="docsign.recover_registration_jobs")
+def recover_registration_task() -> None:
+    # Same pass as the in-process recovery loop in services/job_queue.py.
+    asyncio.run(_recover())
@@ -1,52 +1,130 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from db.models import Document, DocumentParticipant, User
-from typing import List, Dict, Any
+from services.metrics import DOCUMENT_QUERY_SECONDS
+from typing import List, Dict, Any, Iterable, Tuple
+from datetime import datetime
+import base64
+import json
 
-async def get_pending_documents(session: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_DOCUMENT_ID = 2 ** 31 - 1
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, doc_id: int) -> str:
+    raw = json.dumps({"c": created_at.isoformat(), "i": doc_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at, doc_id = datetime.fromisoformat(data["c"]), int(data["i"])
+    except Exception:
+        raise InvalidCursorError("invalid cursor")
+    # Cursors we issue hold a naive UTC timestamp and an int4 id; anything else would fail in the query.
+    if created_at.tzinfo is not None or not 0 < doc_id <= MAX_DOCUMENT_ID:
+        raise InvalidCursorError("invalid cursor")
+    return created_at, doc_id
+
+
+async def _load_parties(session: AsyncSession, document_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+    document_ids = list(document_ids)
+    parties_by_doc: Dict[int, List[Dict[str, Any]]] = {doc_id: [] for doc_id in document_ids}
+    if not document_ids:
+        return parties_by_doc
+
+    with DOCUMENT_QUERY_SECONDS.labels("load_parties").time():
+        result = await session.execute(
+            select(DocumentParticipant, User)
+            .join(User, DocumentParticipant.user_id == User.id)
+            .where(DocumentParticipant.document_id.in_(document_ids))
+            .order_by(DocumentParticipant.document_id, DocumentParticipant.id)
+        )
+        rows = result.all()
+
+    for part, user in rows:
+        parties_by_doc[part.document_id].append({
+            "role": part.role,
+            "status": part.status,
+            "signed_at": part.signed_at.isoformat() if part.signed_at else None,
+            "full_name": user.full_name,
+            "organization": user.organization,
+            "bin": user.bin,
+            "iin": user.iin,
+            "email": user.email
+        })
+
+    return parties_by_doc
+
+
+async def _list_page(
+    session: AsyncSession,
+    user_id: int,
+    participant_status: str,
+    limit: int,
+    cursor: str | None,
+) -> Tuple[list, str | None]:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     stmt = (
         select(Document, DocumentParticipant, User)
         .join(DocumentParticipant, Document.id == DocumentParticipant.document_id)
         .join(User, Document.owner_id == User.id)
         .where(
             DocumentParticipant.user_id == user_id,
-            DocumentParticipant.status == "pending",
-            Document.status != "cancelled"
+            DocumentParticipant.status == participant_status,
+            Document.status.notin_(("cancelled", "registering", "failed"))
         )
-        .order_by(Document.created_at.desc())
+        # Keyset on the participant's copy of the document's created_at, so the
+        # whole page comes from ix_document_participants_listing.
+        .order_by(DocumentParticipant.document_created_at.desc(), DocumentParticipant.document_id.desc())
+        .limit(limit + 1)
     )
-    
-    result = await session.execute(stmt)
-    rows = result.all()
+    if cursor:
+        created_at, doc_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(DocumentParticipant.document_created_at, DocumentParticipant.document_id)
+            < tuple_(created_at, doc_id)
+        )
+
+    with DOCUMENT_QUERY_SECONDS.labels(f"list_{participant_status}").time():
+        result = await session.execute(stmt)
+        rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_doc = rows[-1][0]
+        next_cursor = encode_cursor(last_doc.created_at, last_doc.id)
+
+    return rows, next_cursor
+
+
+async def get_pending_documents(
+    session: AsyncSession,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    rows, next_cursor = await _list_page(session, user_id, "pending", limit, cursor)
+    parties_by_doc = await _load_parties(session, (doc.id for doc, _, _ in rows))
     
     docs = []
     for doc, participant, owner in rows:
-        all_participants = await session.execute(
-            select(DocumentParticipant, User)
-            .join(User, DocumentParticipant.user_id == User.id)
-            .where(DocumentParticipant.document_id == doc.id)
-        )
-        
-        parties = []
-        for part, user in all_participants:
-            parties.append({
-                "role": part.role,
-                "status": part.status,
-                "signed_at": part.signed_at.isoformat() if part.signed_at else None,
-                "full_name": user.full_name,
-                "organization": user.organization,
-                "bin": user.bin,
-                "iin": user.iin,
-                "email": user.email
-            })
-            
         docs.append({
             "id": doc.id,
             "title": doc.title or doc.file_name,
             "created_at": doc.created_at.isoformat(),
             "status": doc.status,
             "file_path": doc.file_path,
-            "parties": parties,
+            "file_sha256": doc.blob_sha256,
+            "parties": parties_by_doc[doc.id],
             "initiator": {
                 "full_name": owner.full_name,
                 "organization": owner.organization,
@@ -56,52 +134,26 @@ async def get_pending_documents(session: AsyncSession, user_id: int) -> List[Dic
             }
         })
         
-    return docs
+    return {"documents": docs, "next_cursor": next_cursor}
 
 
-async def get_signed_documents(session: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
-    stmt = (
-        select(Document, DocumentParticipant, User)
-        .join(DocumentParticipant, Document.id == DocumentParticipant.document_id)
-        .join(User, Document.owner_id == User.id)
-        .where(
-            DocumentParticipant.user_id == user_id,
-            DocumentParticipant.status == "signed",
-            Document.status != "cancelled"
-        )
-        .order_by(Document.created_at.desc())
-    )
-    
-    result = await session.execute(stmt)
-    rows = result.all()
+async def get_signed_documents(
+    session: AsyncSession,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    rows, next_cursor = await _list_page(session, user_id, "signed", limit, cursor)
+    parties_by_doc = await _load_parties(session, (doc.id for doc, _, _ in rows))
     
     docs = []
     for doc, participant, owner in rows:
-        all_participants = await session.execute(
-            select(DocumentParticipant, User)
-            .join(User, DocumentParticipant.user_id == User.id)
-            .where(DocumentParticipant.document_id == doc.id)
-        )
-        
-        parties = []
-        for part, user in all_participants:
-            parties.append({
-                "role": part.role,
-                "status": part.status,
-                "signed_at": part.signed_at.isoformat() if part.signed_at else None,
-                "full_name": user.full_name,
-                "organization": user.organization,
-                "bin": user.bin,
-                "iin": user.iin,
-                "email": user.email
-            })
-            
         docs.append({
             "id": doc.id,
             "created_at": doc.created_at.isoformat(),
             "file_path": doc.file_path,
-            "parties": parties,
+            "parties": parties_by_doc[doc.id],
             "status": doc.status
         })
         
-    return docs
\ No newline at end of file
+    return {"documents": docs, "next_cursor": next_cursor}
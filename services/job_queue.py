@@ -0,0 +1,86 @@
+from typing import List, Set
+import asyncio
+import logging
+from core.log import correlation_id
+from core.tracing import current_traceparent
+from core.settings import settings
+from services.registration_job_service import run_registration_job, recover_stale_jobs
+
+_queue: asyncio.Queue | None = None
+# Jobs waiting in _queue, so recovery does not put one in twice.
+_enqueued: Set[str] = set()
+_workers: List[asyncio.Task] = []
+_recovery: asyncio.Task | None = None
+
+logger = logging.getLogger(__name__)
+
+
+def _get_queue() -> asyncio.Queue:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=settings.JOB_QUEUE_SIZE)
+    return _queue
+
+
+async def _worker() -> None:
+    queue = _get_queue()
+    while True:
+        job_id, context = await queue.get()
+        _enqueued.discard(job_id)
+        try:
+            await run_registration_job(job_id, context)
+        except Exception:
+            logger.exception("Registration job crashed", extra={"job_id": job_id})
+        finally:
+            queue.task_done()
+
+
+async def enqueue_registration(job_id: str) -> None:
+    # The request's correlation id and trace travel with the job so its logs and spans can be joined.
+    context = {"correlation_id": correlation_id.get(), "traceparent": current_traceparent()}
+    if settings.JOB_QUEUE_BACKEND == "celery":
+        from services.celery_app import run_registration_task
+
+        await asyncio.to_thread(run_registration_task.delay, job_id, context)
+        return
+    if job_id in _enqueued:
+        return
+    # A full queue raises asyncio.QueueFull; the job stays queued and recovery picks it up later.
+    _get_queue().put_nowait((job_id, context))
+    _enqueued.add(job_id)
+
+
+async def _recover() -> None:
+    # Only jobs whose worker died (expired lease) or that nobody claimed come back; the claim in
+    # run_registration_job keeps a job that several processes recover from running twice.
+    while True:
+        try:
+            for job_id in await recover_stale_jobs():
+                await enqueue_registration(job_id)
+        except asyncio.QueueFull:
+            logger.warning("Job queue full, recovery deferred")
+        except Exception:
+            logger.exception("Registration job recovery failed")
+        await asyncio.sleep(settings.REGISTRATION_RECOVERY_INTERVAL)
+
+
+async def start_workers() -> None:
+    if settings.JOB_QUEUE_BACKEND != "inprocess" or _workers:
+        return
+    for _ in range(settings.JOB_QUEUE_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+    global _recovery
+    _recovery = asyncio.create_task(_recover())
+
+
+async def stop_workers() -> None:
+    global _queue, _recovery
+    if _recovery is not None:
+        _workers.append(_recovery)
+        _recovery = None
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _enqueued.clear()
+    _queue = None
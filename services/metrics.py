@@ -0,0 +1,94 @@
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+SIGEX_REQUEST_SECONDS = Histogram(
+    "docsign_sigex_request_seconds",
+    "Time until SIGEX answers, by call type",
+    ["call", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+SIGNATURE_PAGE_SECONDS = Histogram(
+    "docsign_add_signature_page_seconds",
+    "PDFSignatureService.add_signature_page duration including the render queue wait",
+    ["pages"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+DOCUMENT_QUERY_SECONDS = Histogram(
+    "docsign_document_query_seconds",
+    "Query time in document_service",
+    ["query"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+DOCUMENTS_CREATED = Counter("docsign_documents_created_total", "Documents accepted for registration")
+SIGNATURES_APPLIED = Counter("docsign_signatures_applied_total", "Signatures added to documents through /sign/addsign")
+
+PAGE_BUCKETS = ((1, "1"), (10, "2-10"), (50, "11-50"), (200, "51-200"))
+
+
+def page_bucket(pages: int) -> str:
+    for limit, label in PAGE_BUCKETS:
+        if pages <= limit:
+            return label
+    return "201+"
+
+
+def response_outcome(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+class StatsCollector:
+    """Exposes the in-process stats dicts of the render pool, caches and DB pools at scrape time."""
+
+    def describe(self):
+        # Without describe() the registry calls collect() on registration,
+        # which would import the modules that import this one.
+        return []
+
+    def collect(self):
+        from services.pdf_render_pool import render_stats
+        from services.signature_cache import signature_cache
+        from services.partner_search_cache import partner_search_cache
+        from db.session import pool_status
+
+        render = render_stats()
+        gauge = GaugeMetricFamily("docsign_pdf_render_queue", "PDF render pool queue", labels=["state"])
+        for state in ("waiting", "in_flight", "queue_depth", "workers"):
+            gauge.add_metric([state], render[state])
+        yield gauge
+        counter = CounterMetricFamily("docsign_pdf_render_jobs", "PDF render pool jobs", labels=["result"])
+        for result in ("completed", "failed", "rejected"):
+            counter.add_metric([result], render[result])
+        yield counter
+        yield CounterMetricFamily(
+            "docsign_pdf_render_wait_seconds", "Time spent waiting for a render slot", value=render["wait_seconds_total"]
+        )
+
+        counter = CounterMetricFamily("docsign_cache_lookups", "Cache lookups", labels=["cache", "result"])
+        counter.add_metric(["signature", "hit"], signature_cache.hits)
+        counter.add_metric(["signature", "miss"], signature_cache.misses)
+        counter.add_metric(["partner_search", "hit"], partner_search_cache.hits)
+        counter.add_metric(["partner_search", "miss"], partner_search_cache.misses)
+        yield counter
+        counter = CounterMetricFamily("docsign_cache_invalidations", "Cache invalidations", labels=["cache"])
+        counter.add_metric(["partner_search"], partner_search_cache.invalidations)
+        yield counter
+
+        pools = pool_status()
+        gauge = GaugeMetricFamily("docsign_db_pool_connections", "DB pool connections", labels=["engine", "state"])
+        for name, status in pools.items():
+            for state in ("size", "checked_in", "checked_out", "overflow"):
+                if state in status:
+                    gauge.add_metric([name, state], status[state])
+        yield gauge
+        counter = CounterMetricFamily("docsign_db_pool_events", "DB pool events", labels=["engine", "event"])
+        for name, status in pools.items():
+            for event in ("connects", "checkouts", "checkins", "invalidations", "timeouts", "overflow_checkouts"):
+                counter.add_metric([name, event], status[event])
+        yield counter
+        counter = CounterMetricFamily("docsign_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", labels=["engine"])
+        for name, status in pools.items():
+            counter.add_metric([name], status["checkout_seconds_total"])
+        yield counter
+
+
+REGISTRY.register(StatsCollector())
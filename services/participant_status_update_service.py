@@ -1,55 +1,52 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from db.models import User, Document, DocumentParticipant
+from sqlalchemy import update, values, column, String, DateTime
+from db.models import User, DocumentParticipant
 from datetime import datetime
 
 async def update_participants_status(
     session: AsyncSession,
     o_doc_id: int,
-    signature_data: Dict[str, Any]
-) -> None:
+    signature_data: Dict[str, Any],
+    commit: bool = True
+) -> List[int]:
 
     signed_data = {}
     for sig in signature_data.get("signatures", []):
         if sig.get("iin") and sig.get("signed_at"):
             signed_data[sig["iin"]] = datetime.strptime(
-                sig["signed_at"], 
+                sig["signed_at"],
                 "%d.%m.%Y %H:%M:%S"
             )
 
     if not signed_data:
-        return
-
-    
-    users_stmt = select(User).where(User.iin.in_(list(signed_data.keys())))
-    users_result = await session.execute(users_stmt)
-    users = users_result.scalars().all()
-    
-    if not users:
-        return
-        
-    
-    user_sign_times = {
-        user.id: signed_data[user.iin] 
-        for user in users
-    }
-
-    participants_stmt = select(DocumentParticipant).where(
-        DocumentParticipant.document_id == o_doc_id,
-        DocumentParticipant.user_id.in_(list(user_sign_times.keys()))
+        return []
+
+    signed = values(
+        column("iin", String),
+        column("signed_at", DateTime),
+        name="signed"
+    ).data(list(signed_data.items()))
+
+    # UPDATE ... FROM users, (VALUES ...) signed — one round trip, and rows
+    # that are already signed are left alone so re-applying is a no-op.
+    stmt = (
+        update(DocumentParticipant)
+        .where(
+            DocumentParticipant.document_id == o_doc_id,
+            DocumentParticipant.user_id == User.id,
+            User.iin == signed.c.iin,
+            DocumentParticipant.status != "signed"
+        )
+        .values(status="signed", signed_at=signed.c.signed_at)
+        .returning(DocumentParticipant.id)
+        .execution_options(synchronize_session=False)
     )
-    
-    participants_result = await session.execute(participants_stmt)
-    participants = participants_result.scalars().all()
-    
-    
-    updates_count = 0
-    for participant in participants:
-        signed_at = user_sign_times[participant.user_id]
-        participant.status = "signed"
-        participant.signed_at = signed_at
-        updates_count += 1
-
-    if updates_count > 0:
+
+    result = await session.execute(stmt)
+    updated_ids = list(result.scalars().all())
+
+    if updated_ids and commit:
         await session.commit()
+
+    return updated_ids
@@ -0,0 +1,60 @@
+from typing import Any, Dict, List, Tuple
+from collections import OrderedDict
+import time
+from core.settings import settings
+
+
+def normalize_query(q: str) -> str:
+    return " ".join(q.split()).lower()
+
+
+class PartnerSearchCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, query: str, limit: int) -> List[Dict[str, Any]] | None:
+        key = (query, limit)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, results = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return results
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, query: str, limit: int, results: List[Dict[str, Any]]) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        key = (query, limit)
+        self._entries[key] = (time.monotonic() + self.ttl, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        # Any changed user row can enter or leave any cached result set, so
+        # there is nothing narrower to drop than everything.
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+partner_search_cache = PartnerSearchCache(
+    max_size=settings.PARTNER_SEARCH_CACHE_SIZE,
+    ttl=settings.PARTNER_SEARCH_CACHE_TTL,
+)
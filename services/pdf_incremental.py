@@ -0,0 +1,226 @@
+from typing import Dict, List, Tuple
+from io import BytesIO
+import os
+import re
+import PyPDF2
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    StreamObject,
+)
+
+STARTXREF_PATTERN = re.compile(rb"startxref\s+(\d+)\s+%%EOF", re.S)
+TAIL_SIZE = 2048
+
+
+class IncrementalUpdateError(Exception):
+    pass
+
+
+def _read_startxref(fh) -> int:
+    fh.seek(0, os.SEEK_END)
+    size = fh.tell()
+    fh.seek(max(size - TAIL_SIZE, 0))
+    matches = STARTXREF_PATTERN.findall(fh.read())
+    if not matches:
+        raise IncrementalUpdateError("startxref not found")
+    return int(matches[-1])
+
+
+def _uses_xref_stream(fh, startxref: int) -> bool:
+    fh.seek(startxref)
+    return not fh.read(4).startswith(b"xref")
+
+
+def first_page_size(reader: PyPDF2.PdfReader) -> Tuple[float, float]:
+    node = reader.trailer["/Root"].get_object()["/Pages"].get_object()
+    mediabox = node.get("/MediaBox")
+    while node.get("/Type") == "/Pages":
+        node = node["/Kids"][0].get_object()
+        mediabox = node.get("/MediaBox", mediabox)
+    if mediabox is None:
+        raise IncrementalUpdateError("page has no MediaBox")
+    mediabox = mediabox.get_object()
+    return float(mediabox[2]), float(mediabox[3])
+
+
+def page_count(reader: PyPDF2.PdfReader) -> int:
+    # /Count of the page tree root; reader.pages would load every page object.
+    return int(reader.trailer["/Root"].get_object()["/Pages"].get_object()["/Count"])
+
+
+def _object_count(reader: PyPDF2.PdfReader) -> int:
+    numbers = [0]
+    for entries in reader.xref.values():
+        numbers.extend(entries)
+    numbers.extend(reader.xref_objStm)
+    size = max(numbers) + 1
+    if "/Size" in reader.trailer:
+        size = max(size, int(reader.trailer["/Size"]))
+    return size
+
+
+class _ObjectCopier:
+    """Renumbers the objects reachable from a foreign page into the update."""
+
+    def __init__(self, next_number: int):
+        self.next_number = next_number
+        self.numbers: Dict[int, int] = {}
+        self.objects: List[Tuple[int, object]] = []
+
+    def reference(self, ref: IndirectObject) -> IndirectObject:
+        if ref.idnum not in self.numbers:
+            number = self.next_number
+            self.next_number += 1
+            self.numbers[ref.idnum] = number
+            self.objects.append((number, self.copy(ref.get_object())))
+        return IndirectObject(self.numbers[ref.idnum], 0, None)
+
+    def copy(self, obj):
+        if isinstance(obj, IndirectObject):
+            return self.reference(obj)
+        if isinstance(obj, StreamObject):
+            copied = StreamObject()
+            copied._data = obj._data
+            for key, value in obj.items():
+                if key != "/Length":
+                    copied[NameObject(key)] = self.copy(value)
+            return copied
+        if isinstance(obj, DictionaryObject):
+            copied = DictionaryObject()
+            for key, value in obj.items():
+                copied[NameObject(key)] = self.copy(value)
+            return copied
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self.copy(value) for value in obj)
+        return obj
+
+
+def _write_object(out: BytesIO, number: int, obj, generation: int = 0) -> None:
+    out.write(f"{number} {generation} obj\n".encode())
+    obj.write_to_stream(out, None)
+    out.write(b"\nendobj\n")
+
+
+def _subsections(offsets: Dict[int, int]) -> List[List[int]]:
+    numbers = sorted(offsets)
+    groups: List[List[int]] = []
+    for number in numbers:
+        if groups and groups[-1][-1] + 1 == number:
+            groups[-1].append(number)
+        else:
+            groups.append([number])
+    return groups
+
+
+def append_page_incremental(file_path: str, page_pdf: bytes, reader: PyPDF2.PdfReader | None = None) -> None:
+    """Appends page_pdf's first page as an incremental update.
+
+    ``reader`` may be a reader already open on file_path, so the file is not parsed twice.
+    """
+    if reader is None:
+        with open(file_path, "rb") as fh:
+            update = _incremental_update(PyPDF2.PdfReader(fh), page_pdf)
+    else:
+        update = _incremental_update(reader, page_pdf)
+    with open(file_path, "ab") as fh:
+        fh.write(update)
+
+
+def _incremental_update(reader: PyPDF2.PdfReader, page_pdf: bytes) -> bytes:
+    if reader.is_encrypted:
+        raise IncrementalUpdateError("encrypted documents are not supported")
+
+    fh = reader.stream
+    startxref = _read_startxref(fh)
+    xref_stream = _uses_xref_stream(fh, startxref)
+    fh.seek(0, os.SEEK_END)
+    base_offset = fh.tell()
+    fh.seek(base_offset - 1)
+    needs_newline = fh.read(1) not in (b"\n", b"\r")
+
+    trailer = reader.trailer
+    root = trailer["/Root"].get_object()
+    pages_ref = root.raw_get("/Pages")
+    if not isinstance(pages_ref, IndirectObject):
+        raise IncrementalUpdateError("page tree root is not an indirect object")
+    pages = pages_ref.get_object()
+
+    new_pages = DictionaryObject()
+    for key, value in pages.items():
+        new_pages[NameObject(key)] = value
+    kids = ArrayObject(pages["/Kids"].get_object())
+
+    copier = _ObjectCopier(_object_count(reader))
+    sig_page = PyPDF2.PdfReader(BytesIO(page_pdf)).pages[0]
+    page_copy = DictionaryObject()
+    for key, value in sig_page.items():
+        if key != "/Parent":
+            page_copy[NameObject(key)] = copier.copy(value)
+    page_copy[NameObject("/Parent")] = IndirectObject(pages_ref.idnum, pages_ref.generation, None)
+    page_copy[NameObject("/Rotate")] = NumberObject(0)
+    page_number = copier.next_number
+    copier.next_number += 1
+    copier.objects.append((page_number, page_copy))
+
+    kids.append(IndirectObject(page_number, 0, None))
+    new_pages[NameObject("/Kids")] = kids
+    new_pages[NameObject("/Count")] = NumberObject(int(pages["/Count"]) + 1)
+
+    out = BytesIO()
+    if needs_newline:
+        out.write(b"\n")
+    offsets: Dict[int, int] = {}
+    generations: Dict[int, int] = {pages_ref.idnum: pages_ref.generation}
+    for number, obj in [(pages_ref.idnum, new_pages)] + copier.objects:
+        offsets[number] = base_offset + out.tell()
+        _write_object(out, number, obj, generations.get(number, 0))
+
+    size = copier.next_number
+    trailer_dict = DictionaryObject()
+    trailer_dict[NameObject("/Root")] = trailer.raw_get("/Root")
+    for key in ("/Info", "/ID"):
+        if key in trailer:
+            trailer_dict[NameObject(key)] = trailer.raw_get(key)
+    trailer_dict[NameObject("/Prev")] = NumberObject(startxref)
+
+    if xref_stream:
+        xref_number = size
+        size += 1
+        xref_offset = base_offset + out.tell()
+        offsets[xref_number] = xref_offset
+        width = 4 if xref_offset < 2 ** 32 else 8
+        index = ArrayObject()
+        rows = BytesIO()
+        for group in _subsections(offsets):
+            index.extend([NumberObject(group[0]), NumberObject(len(group))])
+            for number in group:
+                rows.write(b"\x01")
+                rows.write(offsets[number].to_bytes(width, "big"))
+                rows.write(generations.get(number, 0).to_bytes(2, "big"))
+        xref = StreamObject()
+        xref._data = rows.getvalue()
+        for key, value in trailer_dict.items():
+            xref[NameObject(key)] = value
+        xref[NameObject("/Type")] = NameObject("/XRef")
+        xref[NameObject("/Size")] = NumberObject(size)
+        xref[NameObject("/W")] = ArrayObject([NumberObject(1), NumberObject(width), NumberObject(2)])
+        xref[NameObject("/Index")] = index
+        _write_object(out, xref_number, xref)
+    else:
+        xref_offset = base_offset + out.tell()
+        out.write(b"xref\n")
+        for group in _subsections(offsets):
+            out.write(f"{group[0]} {len(group)}\n".encode())
+            for number in group:
+                out.write(f"{offsets[number]:010d} {generations.get(number, 0):05d} n\r\n".encode())
+        trailer_dict[NameObject("/Size")] = NumberObject(size)
+        out.write(b"trailer\n")
+        trailer_dict.write_to_stream(out, None)
+        out.write(b"\n")
+
+    out.write(f"startxref\n{xref_offset}\n%%EOF\n".encode())
+    return out.getvalue()
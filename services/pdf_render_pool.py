@@ -0,0 +1,172 @@
+from typing import Any, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import fcntl
+import hashlib
+import multiprocessing
+import os
+import time
+import weakref
+from core.log import setup_logging
+from core.settings import settings
+from core.tracing import span
+from services.metrics import SIGNATURE_PAGE_SECONDS, page_bucket
+
+
+class PdfRenderQueueFull(Exception):
+    pass
+
+
+_executor: ProcessPoolExecutor | None = None
+_slots: asyncio.Semaphore | None = None
+_inline = False
+# One writer per file: appends to the same PDF must not interleave.
+_file_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+stats: Dict[str, Any] = {
+    "waiting": 0,
+    "in_flight": 0,
+    "completed": 0,
+    "failed": 0,
+    "rejected": 0,
+    "render_seconds_total": 0.0,
+    "render_seconds_max": 0.0,
+    "wait_seconds_total": 0.0,
+}
+
+
+def _lock_path(file_path: str) -> str:
+    # One lock file per document, all in PDF_LOCK_DIR. They are never removed:
+    # unlinking a flock'ed file lets the next writer lock a different inode.
+    name = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()
+    return os.path.join(settings.PDF_LOCK_DIR, f"{name}.lock")
+
+
+def _render(file_path: str, signature_data: Dict[str, Any], mode: str | None) -> Tuple[float, int]:
+    from services.pdf_signature_service import PDFSignatureService
+
+    started = time.perf_counter()
+    service = PDFSignatureService()
+    # The asyncio lock only covers this process; other app processes and
+    # Celery workers append to the same files.
+    os.makedirs(settings.PDF_LOCK_DIR, exist_ok=True)
+    with open(_lock_path(file_path), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            service.append_signature_page(file_path, signature_data, mode=mode)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return time.perf_counter() - started, service.page_count
+
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(settings.PDF_RENDER_WORKERS, 1))
+    return _slots
+
+
+def _get_executor() -> ProcessPoolExecutor | None:
+    global _executor
+    if _inline or settings.PDF_RENDER_WORKERS <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=setup_logging,
+        )
+    return _executor
+
+
+def start_pool() -> None:
+    _get_executor()
+
+
+def render_inline() -> None:
+    """Renders in the calling process. For Celery workers, which are separate
+    processes already and would otherwise start a spawn pool per task."""
+    global _inline
+    _inline = True
+
+
+def shutdown_pool() -> None:
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+    _slots = None
+
+
+def _file_lock(file_path: str) -> asyncio.Lock:
+    lock = _file_locks.get(file_path)
+    if lock is None:
+        lock = asyncio.Lock()
+        _file_locks[file_path] = lock
+    return lock
+
+
+async def render_signature_page(file_path: str, signature_data: Dict[str, Any], mode: str | None = None) -> str:
+    slots = _get_slots()
+    wait_started = time.perf_counter()
+    if not slots.locked():
+        # A free slot is taken without suspending, so the next caller sees it taken.
+        await slots.acquire()
+    else:
+        # Bounded wait queue: with PDF_RENDER_QUEUE_SIZE callers already
+        # waiting, shed the request now instead of parking it.
+        if stats["waiting"] >= settings.PDF_RENDER_QUEUE_SIZE:
+            stats["rejected"] += 1
+            raise PdfRenderQueueFull("PDF render queue is full")
+        stats["waiting"] += 1
+        try:
+            with span("pdf.render_queue_wait"):
+                await asyncio.wait_for(slots.acquire(), timeout=settings.PDF_RENDER_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            stats["rejected"] += 1
+            raise PdfRenderQueueFull("PDF render queue wait timed out")
+        finally:
+            stats["waiting"] -= 1
+    stats["wait_seconds_total"] += time.perf_counter() - wait_started
+
+    try:
+        # The file lock is taken only once a slot is granted, so a request
+        # waiting in the queue does not hold up other signers of the document.
+        async with _file_lock(file_path):
+            elapsed, pages = await _render_signature_page(file_path, signature_data, mode)
+    finally:
+        slots.release()
+
+    stats["completed"] += 1
+    stats["render_seconds_total"] += elapsed
+    stats["render_seconds_max"] = max(stats["render_seconds_max"], elapsed)
+    SIGNATURE_PAGE_SECONDS.labels(page_bucket(pages)).observe(time.perf_counter() - wait_started)
+    return file_path
+
+
+async def _render_signature_page(file_path: str, signature_data: Dict[str, Any], mode: str | None) -> Tuple[float, int]:
+    stats["in_flight"] += 1
+    try:
+        with span("pdf.render", signatures=len(signature_data.get("signatures", []))) as s:
+            executor = _get_executor()
+            if executor is None:
+                elapsed, pages = await asyncio.to_thread(_render, file_path, signature_data, mode)
+            else:
+                loop = asyncio.get_running_loop()
+                elapsed, pages = await loop.run_in_executor(executor, _render, file_path, signature_data, mode)
+            s.set(pages=pages)
+    except Exception:
+        stats["failed"] += 1
+        raise
+    finally:
+        stats["in_flight"] -= 1
+    return elapsed, pages
+
+
+def render_stats() -> Dict[str, Any]:
+    return {
+        **stats,
+        "queue_depth": stats["waiting"] + stats["in_flight"],
+        "workers": settings.PDF_RENDER_WORKERS,
+        "render_seconds_avg": stats["render_seconds_total"] / stats["completed"] if stats["completed"] else 0.0,
+    }
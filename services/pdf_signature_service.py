@@ -7,10 +7,17 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.utils import ImageReader
 import base64
 from io import BytesIO
+import logging
 import os
 import re
 from datetime import datetime
 import pytz
+from core.settings import settings
+from core.tracing import traced
+from services.pdf_incremental import append_page_incremental, first_page_size, page_count, IncrementalUpdateError
+from services.pdf_render_pool import render_signature_page
+
+logger = logging.getLogger(__name__)
 
 FONT_PATH = os.path.join("static", "fonts", "arial.ttf")
 pdfmetrics.registerFont(TTFont('Arial', FONT_PATH))
@@ -21,6 +28,7 @@ class PDFSignatureService:
         self.label_x = self.margin  
         self.value_x = self.margin + 200
         self.font_size = 10
+        self.page_count = 0
     
 
     def _extract_name(self, subject: str) -> str:
@@ -60,12 +68,7 @@ class PDFSignatureService:
         
         return y
 
-    async def add_signature_page(self, file_path: str, signature_data: Dict[str, Any]) -> str:
-        original = PyPDF2.PdfReader(file_path)
-        page_size = original.pages[0].mediabox
-        page_width = float(page_size[2])
-        page_height = float(page_size[3])
-        
+    def render_signature_page(self, page_width: float, page_height: float, signature_data: Dict[str, Any]) -> bytes:
         signature_page = BytesIO()
         c = canvas.Canvas(signature_page, pagesize=(page_width, page_height))
         c.setFont('Arial', self.font_size)
@@ -137,16 +140,41 @@ class PDFSignatureService:
             y -= 40
         
         c.save()
-        
+        return signature_page.getvalue()
+
+    def _append_rewrite(self, file_path: str, original: PyPDF2.PdfReader, page_pdf: bytes) -> None:
         output = PyPDF2.PdfWriter()
         for page in original.pages:
             output.add_page(page)
         
-        signature_page.seek(0)
-        sig_page = PyPDF2.PdfReader(signature_page)
+        sig_page = PyPDF2.PdfReader(BytesIO(page_pdf))
         output.add_page(sig_page.pages[0])
         
-        with open(file_path, "wb") as output_file:
+        # Write next to the original and swap, so readers never see a partial file.
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as output_file:
             output.write(output_file)
+        os.replace(tmp_path, file_path)
 
-        return file_path
\ No newline at end of file
+    def append_signature_page(self, file_path: str, signature_data: Dict[str, Any], mode: str | None = None) -> str:
+        mode = mode or settings.PDF_APPEND_MODE
+        # One parse of the document serves the page size, the page count and the append itself.
+        with open(file_path, "rb") as fh:
+            reader = PyPDF2.PdfReader(fh)
+            page_width, page_height = first_page_size(reader)
+            self.page_count = page_count(reader)
+            page_pdf = self.render_signature_page(page_width, page_height, signature_data)
+
+            if mode == "incremental":
+                try:
+                    append_page_incremental(file_path, page_pdf, reader)
+                    return file_path
+                except IncrementalUpdateError as e:
+                    logger.warning("Incremental update is not possible", extra={"file_path": file_path, "error": str(e)})
+
+            self._append_rewrite(file_path, reader, page_pdf)
+        return file_path
+
+    @traced("pdf.add_signature_page")
+    async def add_signature_page(self, file_path: str, signature_data: Dict[str, Any]) -> str:
+        return await render_signature_page(file_path, signature_data)
\ No newline at end of file
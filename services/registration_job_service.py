@@ -0,0 +1,211 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+import asyncio
+import logging
+import os
+from sqlalchemy import or_, update
+from core.log import bind_document, correlation_id
+from core.tracing import start_trace
+from core.settings import settings
+from db.session import SessionLocal
+from db.models import Document, RegistrationJob, get_current_time
+from services.blob_service import blob_path
+from services.registration_service import register_document
+from services.participant_status_update_service import update_participants_status
+
+logger = logging.getLogger(__name__)
+
+
+def _remove_file(file_path: str | None) -> None:
+    if file_path and os.path.exists(file_path):
+        os.remove(file_path)
+
+
+async def _set_job(job_id: str, **values: Any) -> None:
+    async with SessionLocal() as session:
+        await session.execute(update(RegistrationJob).where(RegistrationJob.id == job_id).values(**values))
+        await session.commit()
+
+
+async def fail_registration_job(
+    job_id: str, document_id: int, error: str | None, attempts: int, s_id: str | None = None
+) -> None:
+    # SIGEX has no call to withdraw a registration, so one that got through
+    # stays recorded on the failed job (s_id) for manual follow-up.
+    if s_id is not None:
+        logger.warning(
+            "Registration failed after SIGEX registration, left registered in SIGEX",
+            extra={"job_id": job_id, "sigex_document_id": s_id, "error": error},
+        )
+    async with SessionLocal() as session:
+        await session.execute(
+            update(RegistrationJob)
+            .where(RegistrationJob.id == job_id)
+            .values(status="failed", error=error, attempts=attempts, s_id=s_id, lease_expires_at=None)
+        )
+        await session.execute(update(Document).where(Document.id == document_id).values(status="failed"))
+        await session.commit()
+
+
+async def _finalize(job_id: str, document_id: int, result: Dict[str, Any]) -> None:
+    async with SessionLocal() as session:
+        await update_participants_status(
+            session=session,
+            o_doc_id=document_id,
+            signature_data=result["signature_details"],
+            commit=False
+        )
+        await session.execute(
+            update(Document)
+            .where(Document.id == document_id)
+            .values(file_path=result["file_path"], s_id=result["document_id"], status="pending")
+        )
+        await session.execute(
+            update(RegistrationJob)
+            .where(RegistrationJob.id == job_id)
+            .values(status="succeeded", error=None, signature="", lease_expires_at=None)
+        )
+        await session.commit()
+
+
+async def run_registration_job(job_id: str, context: Dict[str, Any] | None = None) -> None:
+    context = context or {}
+    correlation_id.set(context.get("correlation_id") or job_id)
+    bind_document(None)
+    with start_trace("registration_job", context.get("traceparent"), job_id=job_id):
+        await _run_job(job_id)
+
+
+def _lease_deadline() -> datetime:
+    return get_current_time() + timedelta(seconds=settings.REGISTRATION_LEASE_SECONDS)
+
+
+async def _keep_lease(job_id: str) -> None:
+    # Renews the lease while an attempt runs so recovery never hands a live job to another worker.
+    while True:
+        await asyncio.sleep(settings.REGISTRATION_LEASE_SECONDS / 3)
+        await _set_job(job_id, lease_expires_at=_lease_deadline())
+
+
+async def _claim(job_id: str):
+    """Moves a queued job to running and returns what the pipeline needs, or None if another worker has it."""
+    async with SessionLocal() as session:
+        res = await session.execute(
+            update(RegistrationJob)
+            .where(
+                RegistrationJob.id == job_id,
+                RegistrationJob.status == "queued",
+                Document.id == RegistrationJob.document_id,
+            )
+            .values(status="running", lease_expires_at=_lease_deadline())
+            .returning(
+                RegistrationJob.signature,
+                RegistrationJob.participant_count,
+                RegistrationJob.attempts,
+                RegistrationJob.s_id,
+                Document.id.label("document_id"),
+                Document.title,
+                Document.file_name,
+                Document.blob_sha256,
+            )
+        )
+        job = res.one_or_none()
+        await session.commit()
+    return job
+
+
+async def _run_job(job_id: str) -> None:
+    # Phase 1: claim the job and release the connection.
+    job = await _claim(job_id)
+    if job is None:
+        logger.info("Registration job already taken or finished", extra={"job_id": job_id})
+        return
+    bind_document(job.document_id)
+
+    s_id = job.s_id
+
+    async def remember_s_id(document_s_id: str) -> None:
+        # Retries resume from hash fixation instead of registering the document in SIGEX again.
+        nonlocal s_id
+        s_id = document_s_id
+        await _set_job(job_id, s_id=document_s_id)
+
+    attempts = job.attempts
+    # Kept only when a recovered job has no attempts left and the loop below never runs.
+    error = f"Lease expired after {attempts} attempts"
+    lease = asyncio.create_task(_keep_lease(job_id))
+    try:
+        while attempts < settings.REGISTRATION_MAX_ATTEMPTS:
+            attempts += 1
+            await _set_job(job_id, attempts=attempts, lease_expires_at=_lease_deadline())
+
+            # Phase 2: SIGEX calls and rendering with no connection checked out.
+            result = await register_document(
+                title=job.title or job.file_name,
+                source_path=blob_path(job.blob_sha256),
+                signature=job.signature,
+                participant_count=job.participant_count,
+                s_id=s_id,
+                on_registered=remember_s_id
+            )
+
+            if result["success"]:
+                # Phase 3: one short transaction for participants, document and job.
+                try:
+                    await _finalize(job_id, job.document_id, result)
+                    return
+                except Exception as e:
+                    error = f"Finalization failed: {e!r}"
+                    await asyncio.to_thread(_remove_file, result.get("file_path"))
+                    break
+
+            error = result["error"]
+            await asyncio.to_thread(_remove_file, result.get("file_path"))
+            logger.warning(
+                "Registration attempt failed",
+                extra={"job_id": job_id, "attempt": attempts, "s_id": s_id, "error": error}
+            )
+            if attempts < settings.REGISTRATION_MAX_ATTEMPTS:
+                await asyncio.sleep(settings.REGISTRATION_RETRY_BACKOFF * 2 ** (attempts - 1))
+    finally:
+        lease.cancel()
+
+    await fail_registration_job(job_id, job.document_id, error, attempts, s_id)
+
+
+async def recover_stale_jobs() -> List[str]:
+    """Requeues running jobs whose lease expired and returns them with queued jobs left unclaimed for a lease period.
+
+    A requeued job that already used REGISTRATION_MAX_ATTEMPTS is failed by the worker that claims it.
+
+    Jobs a live worker holds keep renewing their lease, so they are never returned; the atomic
+    claim in _run_job drops any job that another process enqueued as well.
+    """
+    now = get_current_time()
+    async with SessionLocal() as session:
+        res = await session.execute(
+            update(RegistrationJob)
+            .where(
+                RegistrationJob.status == "running",
+                or_(RegistrationJob.lease_expires_at.is_(None), RegistrationJob.lease_expires_at < now),
+            )
+            .values(status="queued", lease_expires_at=None)
+            .returning(RegistrationJob.id)
+        )
+        expired = [row.id for row in res]
+        # Touching updated_at restarts the wait, so a job still sitting in a broker queue is
+        # sent again at most once per lease period rather than on every recovery pass.
+        res = await session.execute(
+            update(RegistrationJob)
+            .where(
+                RegistrationJob.status == "queued",
+                RegistrationJob.updated_at < now - timedelta(seconds=settings.REGISTRATION_LEASE_SECONDS),
+            )
+            .values(updated_at=now)
+            .returning(RegistrationJob.id, RegistrationJob.created_at)
+        )
+        unclaimed = [row.id for row in sorted(res, key=lambda row: row.created_at)]
+        await session.commit()
+    if expired:
+        logger.warning("Requeued registration jobs with expired leases", extra={"job_ids": expired})
+    return expired + unclaimed
@@ -1,21 +1,44 @@
-from typing import Dict, Any
-import httpx
-import base64
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable
+import asyncio
+import logging
 import os
+import shutil
 from core.settings import settings
+from core.tracing import span, traced
+from services.sigex_client import get_client
 from services.signature_parser_service import process_signature_data
 from services.pdf_signature_service import PDFSignatureService
-from services.participant_status_update_service import update_participants_status
-from sqlalchemy.ext.asyncio import AsyncSession
 
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+async def _iter_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+@traced("registration.register_document")
 async def register_document(
     title: str,
-    file_base64: str,
+    source_path: str,
     signature: str,
     participant_count: int,
-    session: AsyncSession,
-    o_doc_id: int
+    s_id: str | None = None,
+    on_registered: Callable[[str], Awaitable[None]] | None = None,
 ) -> Dict[str, Any]:
+    """Registers the document with SIGEX, fixes its hash and adds the signature page.
+
+    With ``s_id`` the SIGEX registration from an earlier attempt is reused and
+    the pipeline resumes at hash fixation. ``on_registered`` is awaited with
+    the new SIGEX id as soon as registration succeeds, so the caller can
+    persist it before anything else can fail.
+    """
     registration_payload = {
         "title": title,
         "description": "Подписание документа",
@@ -30,68 +53,97 @@ async def register_document(
         }
     }
     
+    file_path = None
+    document_id = s_id
+    registration_data = None
     try:
-        async with httpx.AsyncClient() as client:
+        client = get_client()
+        if document_id is None:
             registration_response = await client.post(
                 f"{settings.AUTH_BASE_URL}/api",
                 headers={"Content-Type": "application/json"},
-                json=registration_payload
+                json=registration_payload,
+                extensions={"sigex_call": "register"}
             )
-            
-            if registration_response.status_code == 200:
-                registration_data = registration_response.json()
-                # print(f"Registration response: {registration_data}")
-                
-                document_id = registration_data.get("documentId")
-                if document_id:
-                    document_content = base64.b64decode(file_base64)
-                    
-                    hash_fixation_response = await client.post(
-                        f"{settings.AUTH_BASE_URL}/api/{document_id}/data",
-                        headers={
-                            "Content-Type": "application/octet-stream",
-                            "Content-Length": str(len(document_content))
-                        },
-                        content=document_content
-                    )
-                    
-                    # print(f"Hash fixation response: {hash_fixation_response.text}")
-                    
-                    os.makedirs("storage", exist_ok=True)
-                    file_path = f"storage/{document_id}.pdf"
-                    with open(file_path, "wb") as f:
-                        f.write(document_content)
-                    # print(f"File saved to: {file_path}")
-
-                    get_resp = await client.get(f"{settings.AUTH_BASE_URL}/api/{document_id}")
-                    if get_resp.status_code == 200:
-                        get_data = get_resp.json()
-                        signature_details = await process_signature_data(document_id, get_data)
-                        pdf_service = PDFSignatureService()
-                        signed_file_path = await pdf_service.add_signature_page(file_path, signature_details)
-                        await update_participants_status(
-                            session=session,
-                            o_doc_id=o_doc_id,
-                            signature_data=signature_details
-                        )
-                        print(f"Документ с информацией о подписи сохранен: {signed_file_path}")
-                    
-                    return {
-                        "success": True,
-                        "document_id": document_id,
-                        "registration_data": registration_data,
-                        "hash_fixation_response": hash_fixation_response.text,
-                        "document_data": get_data,
-                        "file_path": file_path
-                    }
-                else:
-                    # print("No documentId in registration response")
-                    return {"success": False, "error": "No documentId in registration response"}
-            else:
-                # print(f"Registration failed: {registration_response.status_code} - {registration_response.text}")
+            if registration_response.status_code != 200:
+                logger.warning(
+                    "SIGEX registration failed",
+                    extra={"status_code": registration_response.status_code, "response": registration_response.text},
+                )
                 return {"success": False, "error": f"Registration failed: {registration_response.status_code}"}
-                
+
+            registration_data = registration_response.json()
+            document_id = registration_data.get("documentId")
+            if not document_id:
+                logger.warning("No documentId in registration response", extra={"response": registration_data})
+                return {"success": False, "error": "No documentId in registration response"}
+            logger.info("SIGEX document registered", extra={"sigex_document_id": document_id})
+            if on_registered is not None:
+                await on_registered(document_id)
+        else:
+            logger.info("Resuming SIGEX registration", extra={"sigex_document_id": document_id})
+
+        hash_fixation_response = await client.post(
+            f"{settings.AUTH_BASE_URL}/api/{document_id}/data",
+            headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(os.path.getsize(source_path))
+            },
+            content=_iter_file(source_path),
+            extensions={"sigex_call": "data_upload"}
+        )
+        logger.info(
+            "SIGEX hash fixed",
+            extra={
+                "sigex_document_id": document_id,
+                "status_code": hash_fixation_response.status_code,
+                "response": hash_fixation_response.text,
+            },
+        )
+        if hash_fixation_response.status_code != 200:
+            return {
+                "success": False,
+                "error": f"Hash fixation failed: {hash_fixation_response.status_code}",
+                "document_id": document_id,
+            }
+
+        os.makedirs("storage", exist_ok=True)
+        file_path = f"storage/{document_id}.pdf"
+        with span("registration.store_file"):
+            await asyncio.to_thread(shutil.copyfile, source_path, file_path)
+
+        get_resp = await client.get(
+            f"{settings.AUTH_BASE_URL}/api/{document_id}",
+            extensions={"sigex_call": "get"}
+        )
+        if get_resp.status_code != 200:
+            logger.warning(
+                "SIGEX document fetch failed",
+                extra={"sigex_document_id": document_id, "status_code": get_resp.status_code},
+            )
+            return {
+                "success": False,
+                "error": f"Document fetch failed: {get_resp.status_code}",
+                "document_id": document_id,
+                "file_path": file_path
+            }
+        get_data = get_resp.json()
+        signature_details = await process_signature_data(document_id, get_data)
+        pdf_service = PDFSignatureService()
+        signed_file_path = await pdf_service.add_signature_page(file_path, signature_details)
+        logger.info("Signature page added", extra={"file_path": signed_file_path})
+
+        return {
+            "success": True,
+            "document_id": document_id,
+            "registration_data": registration_data,
+            "hash_fixation_response": hash_fixation_response.text,
+            "document_data": get_data,
+            "signature_details": signature_details,
+            "file_path": file_path
+        }
+
     except Exception as e:
-        # print(f"Error during document registration: {e}")
-        return {"success": False, "error": str(e)}
+        logger.exception("Document registration failed")
+        return {"success": False, "error": str(e), "document_id": document_id, "file_path": file_path}
  
\ No newline at end of file
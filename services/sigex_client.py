@@ -0,0 +1,71 @@
+import time
+import httpx
+from core.settings import settings
+from core.tracing import span, TRACEPARENT_HEADER
+from services.metrics import SIGEX_REQUEST_SECONDS, response_outcome
+
+_client: httpx.AsyncClient | None = None
+
+
+class _TimedTransport(httpx.AsyncBaseTransport):
+    """Records how long SIGEX takes to answer, labelled by the request's ``sigex_call`` extension."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        call = request.extensions.get("sigex_call", "other")
+        started = time.perf_counter()
+        with span(f"sigex.{call}", method=request.method, path=request.url.path) as s:
+            if s.sampled:
+                request.headers[TRACEPARENT_HEADER] = s.traceparent
+            try:
+                response = await self._transport.handle_async_request(request)
+            except Exception:
+                SIGEX_REQUEST_SECONDS.labels(call, "error").observe(time.perf_counter() - started)
+                raise
+            s.set(status_code=response.status_code)
+        SIGEX_REQUEST_SECONDS.labels(call, response_outcome(response.status_code)).observe(time.perf_counter() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _build_client() -> httpx.AsyncClient:
+    transport = httpx.AsyncHTTPTransport(
+        http2=settings.SIGEX_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.SIGEX_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SIGEX_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.SIGEX_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return httpx.AsyncClient(
+        base_url=settings.AUTH_BASE_URL.rstrip("/"),
+        transport=_TimedTransport(transport),
+        timeout=httpx.Timeout(
+            connect=settings.SIGEX_CONNECT_TIMEOUT,
+            read=settings.SIGEX_READ_TIMEOUT,
+            write=settings.SIGEX_WRITE_TIMEOUT,
+            pool=settings.SIGEX_POOL_TIMEOUT,
+        ),
+    )
+
+
+async def open_client() -> httpx.AsyncClient:
+    return get_client()
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
@@ -0,0 +1,90 @@
+from typing import Any, Dict, Tuple
+from collections import OrderedDict
+import copy
+import json
+import logging
+from core.settings import settings
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+class SignatureCache:
+    def __init__(self, max_size: int, redis_url: str | None = None, ttl: int | None = None):
+        self.max_size = max_size
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._redis = None
+        self.hits = 0
+        self.misses = 0
+
+    def _redis_client(self):
+        if self._redis is None and self.redis_url and redis_asyncio is not None:
+            self._redis = redis_asyncio.from_url(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def _redis_key(key: Tuple[str, str]) -> str:
+        return f"docsign:signature:{key[0]}:{key[1]}"
+
+    def _remember(self, key: Tuple[str, str], value: Dict[str, Any]) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get(self, document_id: str, sign_id: Any) -> Dict[str, Any] | None:
+        key = (str(document_id), str(sign_id))
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(value)
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = await client.get(self._redis_key(key))
+            except Exception as e:
+                logger.warning("Signature cache backend error", extra={"error": repr(e)})
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._remember(key, value)
+                self.hits += 1
+                return copy.deepcopy(value)
+
+        self.misses += 1
+        return None
+
+    async def set(self, document_id: str, sign_id: Any, value: Dict[str, Any]) -> None:
+        key = (str(document_id), str(sign_id))
+        value = copy.deepcopy(value)
+        self._remember(key, value)
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                await client.set(self._redis_key(key), json.dumps(value), ex=self.ttl)
+            except Exception as e:
+                logger.warning("Signature cache backend error", extra={"error": repr(e)})
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+signature_cache = SignatureCache(
+    max_size=settings.SIGNATURE_CACHE_SIZE,
+    redis_url=settings.SIGNATURE_CACHE_REDIS_URL,
+    ttl=settings.SIGNATURE_CACHE_TTL,
+)
@@ -1,8 +1,15 @@
 from typing import Dict, Any, List
 from datetime import datetime
+import asyncio
+import logging
 import re
 import httpx
 from core.settings import settings
+from core.tracing import current_span, span, traced
+from services.sigex_client import get_client
+from services.signature_cache import signature_cache
+
+logger = logging.getLogger(__name__)
 
 def format_timestamp(timestamp: int) -> str:
     return datetime.fromtimestamp(timestamp / 1000).strftime("%d.%m.%Y %H:%M:%S")
@@ -11,71 +18,128 @@ def extract_iin(subject: str) -> str:
     match = re.search(r'SERIALNUMBER=IIN(\d+)', subject)
     return match.group(1) if match else ""
 
+def parse_signature(sig: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "sign_id": sig["signId"],
+        "signed_at": format_timestamp(sig["storedAt"]),
+        "subject": sig["subject"],
+        "iin": extract_iin(sig["subject"]),
+        "key_usages": [
+            usage for usage in sig["keyUsages"] 
+            if usage in ["digitalSignature", "nonRepudiation"]
+        ],
+        "validity": {
+            "from": format_timestamp(sig["from"]),
+            "until": format_timestamp(sig["until"])
+        },
+        "issuer": sig["issuer"]
+    }
+
+async def fetch_qr_codes(
+    client: httpx.AsyncClient,
+    document_id: str,
+    sign_id: Any,
+    semaphore: asyncio.Semaphore,
+) -> Dict[str, Any] | None:
+    try:
+        with span("signature_parser.fetch_qr_codes", sign_id=str(sign_id)):
+            async with semaphore:
+                qr_response = await client.get(
+                    f"{settings.AUTH_BASE_URL}/api/{document_id}/signature/{sign_id}/qr",
+                    params={
+                        "signFormat": 0,
+                        "qrVersion": 25,
+                        "qrLevel": "M"
+                    },
+                    timeout=settings.SIGEX_QR_TIMEOUT,
+                    extensions={"sigex_call": "qr"}
+                )
+
+        if qr_response.status_code != 200:
+            logger.warning(
+                "QR fetch failed",
+                extra={
+                    "sigex_document_id": document_id,
+                    "sign_id": sign_id,
+                    "status_code": qr_response.status_code,
+                    "response": qr_response.text,
+                },
+            )
+            return None
+
+        qr_data = qr_response.json()
+        if "qrCodes" in qr_data and qr_data["qrCodes"]:
+            return {
+                "qr_codes": qr_data["qrCodes"],
+                "qr_info": {
+                    "document_id": qr_data["documentId"],
+                    "sign_id": qr_data["signId"],
+                    "sign_type": qr_data["signType"],
+                    "sign_format": qr_data["signFormat"],
+                    "total_qr_codes": len(qr_data["qrCodes"])
+                }
+            }
+        return None
+    except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+        # A malformed QR answer costs this signature its QR codes, not the whole document.
+        logger.warning(
+            "QR fetch failed", extra={"sigex_document_id": document_id, "sign_id": sign_id, "error": repr(e)}
+        )
+        return None
+
+@traced("signature_parser.process_signature_data")
 async def process_signature_data(document_id: str, get_data: Dict[str, Any]) -> Dict[str, Any]:
     total_signatures = get_data.get("signaturesTotal", 0)
-    print(f"\nВсего подписей: {total_signatures}")
-    
+
     result = {
         "total_signatures": total_signatures,
         "signatures": []
     }
     
     signatures = get_data.get("signatures", [])
-    async with httpx.AsyncClient() as client:
-        for index, sig in enumerate(signatures, 1):
-            signature_info = {
-                "sign_id": sig["signId"],
-                "signed_at": format_timestamp(sig["storedAt"]),
-                "subject": sig["subject"],
-                "iin": extract_iin(sig["subject"]),
-                "key_usages": [
-                    usage for usage in sig["keyUsages"] 
-                    if usage in ["digitalSignature", "nonRepudiation"]
-                ],
-                "validity": {
-                    "from": format_timestamp(sig["from"]),
-                    "until": format_timestamp(sig["until"])
-                },
-                "issuer": sig["issuer"]
-            }
-            
-            
-            qr_response = await client.get(
-                f"{settings.AUTH_BASE_URL}/api/{document_id}/signature/{sig['signId']}/qr",
-                params={
-                    "signFormat": 0,
-                    "qrVersion": 25,
-                    "qrLevel": "M"
-                }
-            )
-            if qr_response.status_code == 200:
-                qr_data = qr_response.json()
-                
-                
-                if "qrCodes" in qr_data and qr_data["qrCodes"]:
-                    signature_info["qr_codes"] = qr_data["qrCodes"]
-                    signature_info["qr_info"] = {
-                        "document_id": qr_data["documentId"],
-                        "sign_id": qr_data["signId"],
-                        "sign_type": qr_data["signType"],
-                        "sign_format": qr_data["signFormat"],
-                        "total_qr_codes": len(qr_data["qrCodes"])
-                    }
-            else:
-                print(f"Failed to get QR codes: {qr_response.status_code} - {qr_response.text}")
-            
-            result["signatures"].append(signature_info)
-            
-            print(f"\n=== Информация о подписи #{index} ===")
-            print(f"ID подписи: {signature_info['sign_id']}")
-            print(f"Время подписания: {signature_info['signed_at']}")
-            print(f"Подписант: {signature_info['subject']}")
-            print(f"ИИН: {signature_info['iin']}")
-            print(f"Тип подписи: {', '.join(signature_info['key_usages'])}")
-            print(f"Действителен с: {signature_info['validity']['from']}")
-            print(f"Действителен по: {signature_info['validity']['until']}")
-            print(f"Издатель: {signature_info['issuer']}")
-            print(f"Количество QR-кодов: {len(signature_info.get('qr_codes', []))}")
-            print("=" * 40)
-    
-    return result
\ No newline at end of file
+    client = get_client()
+    semaphore = asyncio.Semaphore(settings.SIGEX_QR_CONCURRENCY)
+
+    with span("signature_parser.cache_lookup", signatures=len(signatures)):
+        cached = await asyncio.gather(*[
+            signature_cache.get(document_id, sig["signId"]) for sig in signatures
+        ])
+    signature_infos = [
+        cached_info if cached_info is not None else parse_signature(sig)
+        for sig, cached_info in zip(signatures, cached)
+    ]
+    missing = [info for info, cached_info in zip(signature_infos, cached) if cached_info is None]
+    qr_results = await asyncio.gather(*[
+        fetch_qr_codes(client, document_id, info["sign_id"], semaphore)
+        for info in missing
+    ])
+
+    for signature_info, qr_result in zip(missing, qr_results):
+        if qr_result:
+            signature_info.update(qr_result)
+            await signature_cache.set(document_id, signature_info["sign_id"], signature_info)
+
+    result["signatures"].extend(signature_infos)
+    current_span().set(signatures=len(signature_infos), qr_fetched=len(missing))
+    logger.info(
+        "Signatures processed",
+        extra={
+            "sigex_document_id": document_id,
+            "total_signatures": total_signatures,
+            "cached": len(signature_infos) - len(missing),
+        },
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        for signature_info in signature_infos:
+            logger.debug("Signature", extra={
+                "sign_id": signature_info["sign_id"],
+                "signed_at": signature_info["signed_at"],
+                "subject": signature_info["subject"],
+                "iin": signature_info["iin"],
+                "key_usages": signature_info["key_usages"],
+                "validity": signature_info["validity"],
+                "issuer": signature_info["issuer"],
+                "qr_codes": len(signature_info.get("qr_codes", [])),
+            })
+
+    return result
@@ -1,32 +1,43 @@
 from typing import Dict, Any
-import httpx
 from datetime import datetime
+import logging
 from core.settings import settings
+from core.tracing import traced
+from services.sigex_client import get_client
 from services.signature_parser_service import process_signature_data
 from services.pdf_signature_service import PDFSignatureService
 
+logger = logging.getLogger(__name__)
+
+@traced("signature.add_signature")
 async def add_signature(document_id: str, signature: str) -> Dict[str, Any]:
     payload = {"signType": "cms", "signature": signature}
     try:
-        async with httpx.AsyncClient() as client:
-            add_resp = await client.post(
-                f"{settings.AUTH_BASE_URL}/api/{document_id}",
-                headers={"Content-Type": "application/json"},
-                json=payload
-            )
-            if add_resp.status_code == 200:
-                add_data = add_resp.json()
-            else:
-                add_data = {"status": add_resp.status_code, "text": add_resp.text}
-            print(add_data)
+        client = get_client()
+        add_resp = await client.post(
+            f"{settings.AUTH_BASE_URL}/api/{document_id}",
+            headers={"Content-Type": "application/json"},
+            json=payload,
+            extensions={"sigex_call": "add_signature"}
+        )
+        if add_resp.status_code == 200:
+            add_data = add_resp.json()
+        else:
+            add_data = {"status": add_resp.status_code, "text": add_resp.text}
+        logger.info("SIGEX add signature", extra={
+            "sigex_document_id": document_id, "status_code": add_resp.status_code, "add_result": add_data,
+        })
 
-            get_resp = await client.get(f"{settings.AUTH_BASE_URL}/api/{document_id}")
-            if get_resp.status_code == 200:
-                get_data = get_resp.json()
-                signature_details = await process_signature_data(document_id, get_data)
-                
+        get_resp = await client.get(
+            f"{settings.AUTH_BASE_URL}/api/{document_id}",
+            extensions={"sigex_call": "get"}
+        )
+        if get_resp.status_code == 200:
+            get_data = get_resp.json()
+            signature_details = await process_signature_data(document_id, get_data)
             
-            return {"add_result": add_data, "get_result": get_data, "signature_details": signature_details}
+        
+        return {"add_result": add_data, "get_result": get_data, "signature_details": signature_details}
     except Exception as e:
-        print({"error": str(e)}) 
+        logger.exception("Adding signature failed", extra={"sigex_document_id": document_id})
         return {"error": str(e)}
@@ -0,0 +1,135 @@
+from typing import Any, AsyncIterator, Dict, List
+import hashlib
+import os
+import tempfile
+
+try:
+    import python_multipart as multipart
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:
+    import multipart
+    from multipart.multipart import parse_options_header
+
+from core.settings import settings
+
+MAX_FIELD_SIZE = 256 * 1024
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadTooLargeError(UploadError):
+    pass
+
+
+def _spool_dir() -> str:
+    path = os.path.join(settings.BLOB_STORAGE_DIR, "tmp")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def discard_upload(upload: Dict[str, Any] | None) -> None:
+    if upload and os.path.exists(upload["path"]):
+        os.remove(upload["path"])
+
+
+async def parse_document_upload(
+    stream: AsyncIterator[bytes],
+    content_type: str,
+    max_size: int,
+    file_field: str = "file",
+) -> Dict[str, Any]:
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadError("multipart boundary is missing")
+
+    fields: Dict[str, List[str]] = {}
+    upload: Dict[str, Any] | None = None
+    state: Dict[str, Any] = {"header_field": b"", "header_value": b"", "headers": {}}
+
+    def on_part_begin():
+        state["headers"] = {}
+        state["name"] = None
+        state["file"] = None
+        state["buffer"] = bytearray()
+
+    def on_header_field(data: bytes, start: int, end: int):
+        state["header_field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        state["header_value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header_field"].lower()] = state["header_value"]
+        state["header_field"] = b""
+        state["header_value"] = b""
+
+    def on_headers_finished():
+        nonlocal upload
+        _, options = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        state["name"] = name
+        if name == file_field and b"filename" in options:
+            if upload is not None:
+                raise UploadError("only one file part is allowed")
+            fd, path = tempfile.mkstemp(dir=_spool_dir(), suffix=".part")
+            upload = {
+                "path": path,
+                "filename": options[b"filename"].decode("utf-8", "replace"),
+                "size": 0,
+                "sha256": None,
+            }
+            state["file"] = os.fdopen(fd, "wb")
+            state["hasher"] = hashlib.sha256()
+
+    def on_part_data(data: bytes, start: int, end: int):
+        chunk = data[start:end]
+        if state["file"] is not None:
+            upload["size"] += len(chunk)
+            if upload["size"] > max_size:
+                raise UploadTooLargeError(f"file exceeds {max_size} bytes")
+            state["file"].write(chunk)
+            state["hasher"].update(chunk)
+        else:
+            state["buffer"] += chunk
+            if len(state["buffer"]) > MAX_FIELD_SIZE:
+                raise UploadError(f"field {state['name']} is too large")
+
+    def on_part_end():
+        if state["file"] is not None:
+            state["file"].close()
+            state["file"] = None
+            upload["sha256"] = state["hasher"].hexdigest()
+        elif state["name"]:
+            fields.setdefault(state["name"], []).append(state["buffer"].decode("utf-8", "replace"))
+
+    parser = multipart.MultipartParser(
+        boundary,
+        {
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        },
+    )
+
+    try:
+        async for chunk in stream:
+            parser.write(chunk)
+        parser.finalize()
+    except Exception:
+        if state.get("file") is not None:
+            state["file"].close()
+        discard_upload(upload)
+        raise
+
+    if upload is None or upload["sha256"] is None:
+        discard_upload(upload)
+        raise UploadError(f"{file_field} part is missing")
+
+    return {"fields": fields, "file": upload}
@@ -15,6 +15,7 @@ const signLog = document.getElementById('signLog');
 let selectedIds = [];
 let pdfBase64 = '';
 let pdfFileName = '';
+let pdfFile = null;
 
 function renderAlert(type, message) {
     createAlert.innerHTML = `<div class="alert alert-${type} alert-dismissible" role="alert">${message}<button type="button" class="btn-close" data-bs-dismiss="alert" aria-label="Close"></button></div>`;
@@ -106,6 +107,7 @@ if (pdfInput) {
         const file = pdfInput.files && pdfInput.files[0];
         pdfBase64 = '';
         pdfFileName = '';
+        pdfFile = null;
         pdfPreview.style.display = 'none';
         pdfPlaceholder.style.display = 'flex';
         pdfInfo.textContent = '';
@@ -116,6 +118,7 @@ if (pdfInput) {
             return;
         }
         pdfFileName = file.name;
+        pdfFile = file;
         const reader = new FileReader();
         reader.onload = () => {
             const result = reader.result;
@@ -158,6 +161,7 @@ if (resetFormBtn) {
         pdfInput.value = '';
         pdfBase64 = '';
         pdfFileName = '';
+        pdfFile = null;
         pdfPreview.style.display = 'none';
         pdfPreview.src = '';
         pdfPlaceholder.style.display = 'flex';
@@ -166,6 +170,29 @@ if (resetFormBtn) {
     });
 }
 
+async function waitForRegistration(job, attempt = 0) {
+    try {
+        const resp = await fetch(job.status_url, { credentials: 'same-origin' });
+        if (!resp.ok) {
+            renderAlert('danger', 'Не удалось получить статус регистрации документа');
+            return;
+        }
+        const data = await resp.json();
+        if (data.status === 'succeeded') {
+            renderAlert('success', `Документ создан. ID: ${data.document_id}`);
+            return;
+        }
+        if (data.status === 'failed') {
+            renderAlert('danger', `Ошибка регистрации документа: ${data.error || ''}`);
+            return;
+        }
+    } catch (e) {
+        console.error('Ошибка получения статуса:', e);
+    }
+    const delay = Math.min(1000 * Math.pow(1.5, attempt), 10000);
+    setTimeout(() => waitForRegistration(job, attempt + 1), delay);
+}
+
 async function signWithEcp() {
     if (!pdfBase64) {
         renderAlert('warning', 'Сначала загрузите PDF');
@@ -183,17 +210,16 @@ async function signWithEcp() {
         if (signLog) signLog.innerText = `Готово. Размер подписи: ${size} символов.`;
         
         try {
-            const resp = await fetch('/documents', {
+            const form = new FormData();
+            form.append('title', pdfFileName);
+            form.append('file_name', pdfFileName);
+            form.append('signature', signature);
+            selectedIds.forEach(u => form.append('participant_user_ids', u.id));
+            form.append('file', pdfFile, pdfFileName);
+            const resp = await fetch('/documents/upload', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
                 credentials: 'same-origin',
-                body: JSON.stringify({
-                    title: pdfFileName,
-                    file_name: pdfFileName,
-                    file_base64: pdfBase64,
-                    signature: signature,
-                    participant_user_ids: selectedIds.map(u => u.id)
-                })
+                body: form
             });
             if (!resp.ok) {
                 const text = await resp.text();
@@ -201,12 +227,14 @@ async function signWithEcp() {
                 return;
             }
             const data = await resp.json();
-            renderAlert('success', `Документ создан. ID: ${data.document_id}`);
+            renderAlert('info', 'Документ принят, идёт регистрация...');
+            waitForRegistration(data);
             selectedIds = [];
             renderSelected();
             pdfInput.value = '';
             pdfBase64 = '';
             pdfFileName = '';
+            pdfFile = null;
             pdfPreview.style.display = 'none';
             pdfPreview.src = '';
             pdfPlaceholder.style.display = 'flex';
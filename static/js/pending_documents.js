@@ -1,47 +1,70 @@
 const pendingDocsList = document.getElementById('pendingDocsList');
 const emptyPendingState = document.getElementById('emptyPendingState');
 const docsPerPage = document.getElementById('docsPerPage');
-const pagination = document.getElementById('pagination');
-const showingFrom = document.getElementById('showingFrom');
-const showingTo = document.getElementById('showingTo');
-const totalDocs = document.getElementById('totalDocs');
+const pendingSentinel = document.getElementById('pendingSentinel');
+const pendingLoading = document.getElementById('pendingLoading');
+const loadedDocs = document.getElementById('loadedDocs');
 
-let currentPage = 1;
-let allDocuments = [];
+let nextCursor = null;
+let hasMore = true;
+let isLoading = false;
+let loadedCount = 0;
+// The in-flight load; a reset aborts it and a replaced load drops its response.
+let loadController = null;
 
-async function loadPendingDocuments() {
+async function loadPendingDocuments(reset = false) {
+    if (reset) {
+        if (loadController) loadController.abort();
+        loadController = null;
+        isLoading = false;
+        nextCursor = null;
+        hasMore = true;
+        loadedCount = 0;
+        pendingDocsList.innerHTML = '';
+    }
+    if (isLoading || !hasMore) return;
+    isLoading = true;
+    const controller = new AbortController();
+    loadController = controller;
+    pendingLoading.style.display = 'block';
     try {
-        const response = await fetch('/documents/pending', {
-            credentials: 'same-origin'
+        const params = new URLSearchParams({ limit: docsPerPage.value });
+        if (nextCursor) params.set('cursor', nextCursor);
+        const response = await fetch(`/documents/pending?${params}`, {
+            credentials: 'same-origin',
+            signal: controller.signal
         });
         const data = await response.json();
+        if (controller !== loadController) return;
+        const documents = data.documents || [];
+        
+        nextCursor = data.next_cursor || null;
+        hasMore = Boolean(nextCursor);
         
-        if (!data.documents || data.documents.length === 0) {
-            pendingDocsList.innerHTML = '';
+        if (loadedCount === 0 && documents.length === 0) {
             emptyPendingState.style.display = 'block';
-            pagination.innerHTML = '';
-            updateShowingInfo(0, 0, 0);
+            updateLoadedInfo();
             return;
         }
         
-        allDocuments = data.documents;
         emptyPendingState.style.display = 'none';
-        renderDocuments();
+        appendDocuments(documents);
     } catch (error) {
-        console.error('Error loading pending documents:', error);
+        if (error.name !== 'AbortError') {
+            console.error('Error loading pending documents:', error);
+        }
+    } finally {
+        if (controller === loadController) {
+            loadController = null;
+            isLoading = false;
+            pendingLoading.style.display = 'none';
+        }
     }
 }
 
-function renderDocuments() {
-    const perPage = parseInt(docsPerPage.value);
-    const start = (currentPage - 1) * perPage;
-    const end = start + perPage;
-    const pageDocuments = allDocuments.slice(start, end);
-    
-    updateShowingInfo(start + 1, Math.min(end, allDocuments.length), allDocuments.length);
-    renderPagination(Math.ceil(allDocuments.length / perPage));
-    
-    pendingDocsList.innerHTML = pageDocuments.map((doc, index) => {
+function appendDocuments(documents) {
+    const start = loadedCount;
+    pendingDocsList.insertAdjacentHTML('beforeend', documents.map((doc, index) => {
         const partiesInfo = doc.parties.map(p => {
             const info = [];
             if (p.role === 'initiator') info.push('Инициатор');
@@ -76,62 +99,20 @@ function renderDocuments() {
                         <button class="btn btn-sm btn-outline-primary" onclick="viewDocument(${doc.id}, '${doc.file_path}')">
                             <i class="bi bi-eye"></i> Открыть
                         </button>
-                        <button class="btn btn-sm btn-primary" onclick="signDocument(${doc.id})">
+                        <button class="btn btn-sm btn-primary" onclick="signDocument(${doc.id}, '${doc.file_sha256 || ''}')">
                             <i class="bi bi-pen"></i> Подписать
                         </button>
                     </div>
                 </td>
             </tr>
         `;
-    }).join('');
-}
-
-function renderPagination(totalPages) {
-    if (totalPages <= 1) {
-        pagination.innerHTML = '';
-        return;
-    }
-
-    let pages = '';
-    pages += `
-        <li class="page-item ${currentPage === 1 ? 'disabled' : ''}">
-            <a class="page-link" href="#" data-page="${currentPage - 1}">
-                <i class="bi bi-chevron-left"></i>
-            </a>
-        </li>
-    `;
-    
-    for (let i = 1; i <= totalPages; i++) {
-        if (i === 1 || i === totalPages || (i >= currentPage - 1 && i <= currentPage + 1)) {
-            pages += `
-                <li class="page-item ${i === currentPage ? 'active' : ''}">
-                    <a class="page-link" href="#" data-page="${i}">${i}</a>
-                </li>
-            `;
-        } else if (i === currentPage - 2 || i === currentPage + 2) {
-            pages += `
-                <li class="page-item disabled">
-                    <span class="page-link">...</span>
-                </li>
-            `;
-        }
-    }
-    
-    pages += `
-        <li class="page-item ${currentPage === totalPages ? 'disabled' : ''}">
-            <a class="page-link" href="#" data-page="${currentPage + 1}">
-                <i class="bi bi-chevron-right"></i>
-            </a>
-        </li>
-    `;
-    
-    pagination.innerHTML = pages;
+    }).join(''));
+    loadedCount += documents.length;
+    updateLoadedInfo();
 }
 
-function updateShowingInfo(from, to, total) {
-    showingFrom.textContent = from;
-    showingTo.textContent = to;
-    totalDocs.textContent = total;
+function updateLoadedInfo() {
+    loadedDocs.textContent = loadedCount;
 }
 
 function viewDocument(id, filePath) {
@@ -140,25 +121,22 @@ function viewDocument(id, filePath) {
     modal.show();
 }
 
-window.signDocument = function(id) {
-    window.openSignModal(id);
+window.viewDocument = viewDocument;
+
+window.signDocument = function(id, fileSha256) {
+    window.openSignModal(id, fileSha256);
 }
 
 docsPerPage.addEventListener('change', () => {
-    currentPage = 1;
-    renderDocuments();
+    loadPendingDocuments(true);
 });
 
-pagination.addEventListener('click', (e) => {
-    e.preventDefault();
-    const pageLink = e.target.closest('[data-page]');
-    if (pageLink) {
-        const newPage = parseInt(pageLink.dataset.page);
-        if (newPage !== currentPage && newPage > 0) {
-            currentPage = newPage;
-            renderDocuments();
-        }
+const pendingObserver = new IntersectionObserver((entries) => {
+    if (entries.some(entry => entry.isIntersecting)) {
+        loadPendingDocuments();
     }
-});
+}, { rootMargin: '200px' });
 
-document.addEventListener('DOMContentLoaded', loadPendingDocuments);
\ No newline at end of file
+document.addEventListener('DOMContentLoaded', () => {
+    loadPendingDocuments(true).then(() => pendingObserver.observe(pendingSentinel));
+});
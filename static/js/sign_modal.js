@@ -1,10 +1,12 @@
-window.openSignModal = function(documentId) {
+window.openSignModal = function(documentId, fileSha256) {
   const el = document.getElementById('signModal');
   if (!el) return;
   if (documentId) {
     el.dataset.documentId = String(documentId);
+    el.dataset.fileSha256 = fileSha256 || '';
   } else {
     delete el.dataset.documentId;
+    delete el.dataset.fileSha256;
   }
   const btn = el.querySelector('#ecpSignBtn');
   if (btn) {
@@ -16,8 +18,9 @@ window.openSignModal = function(documentId) {
         const id = el.dataset.documentId;
         if (id) {
           if (logEl) logEl.innerText = 'Получение документа...';
-          const data = await window.signService.getBase64(id);
-          const base64 = data && data.file_base64 ? data.file_base64 : '';
+          const fileSha256 = el.dataset.fileSha256;
+          if (!fileSha256) throw new Error('Файл документа не найден');
+          const base64 = await window.signService.getFileBase64(fileSha256);
           if (!base64) throw new Error('Пустое содержимое файла');
           const { default: ncaWebSocketManager } = await import('./ncaWebSocketManager.js');
           const { signData } = await import('./ncalayer.js');
@@ -28,7 +31,7 @@ window.openSignModal = function(documentId) {
             const signature = await signData(base64);
             const size = signature ? signature.length : 0;
             console.log('Вторая подпись (CMS):', signature);
-            await window.signService.addSign(id, base64, signature);
+            await window.signService.addSign(id, signature);
             if (logEl) logEl.innerText = `Готово. Размер подписи: ${size} символов.`;
           } finally {
             ncaWebSocketManager.disconnect();
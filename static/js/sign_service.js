@@ -1,23 +1,32 @@
-export async function getBase64(documentId) {
-  const resp = await fetch(`/sign/getbase64?document_id=${encodeURIComponent(documentId)}`, {
+function arrayBufferToBase64(buffer) {
+  const bytes = new Uint8Array(buffer);
+  const chunkSize = 0x8000;
+  let binary = '';
+  for (let i = 0; i < bytes.length; i += chunkSize) {
+    binary += String.fromCharCode.apply(null, bytes.subarray(i, i + chunkSize));
+  }
+  return btoa(binary);
+}
+
+export async function getFileBase64(fileSha256) {
+  const resp = await fetch(`/sign/file/${encodeURIComponent(fileSha256)}`, {
     credentials: 'same-origin'
   });
   if (!resp.ok) {
     const text = await resp.text();
     throw new Error(text || 'request failed');
   }
-  const data = await resp.json();
-  console.log('getbase64', data);
-  return data;
+  const buffer = await resp.arrayBuffer();
+  return arrayBufferToBase64(buffer);
 }
 
 
-export async function addSign(document_id, file_base64, signature) {
+export async function addSign(document_id, signature) {
   const resp = await fetch('/sign/addsign', {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     credentials: 'same-origin',
-    body: JSON.stringify({ document_id, file_base64, signature })
+    body: JSON.stringify({ document_id, signature })
   });
   if (!resp.ok) {
     const text = await resp.text();
@@ -28,4 +37,4 @@ export async function addSign(document_id, file_base64, signature) {
   return data;
 }
 
-window.signService = { getBase64, addSign };
\ No newline at end of file
+window.signService = { getFileBase64, addSign };
\ No newline at end of file
@@ -1,47 +1,70 @@
 const signedDocsList = document.getElementById('signedDocsList');
 const signedEmptyState = document.getElementById('signedEmptyState');
 const signedDocsPerPage = document.getElementById('signedDocsPerPage');
-const signedPagination = document.getElementById('signedPagination');
-const signedShowingFrom = document.getElementById('signedShowingFrom');
-const signedShowingTo = document.getElementById('signedShowingTo');
-const signedTotalDocs = document.getElementById('signedTotalDocs');
+const signedSentinel = document.getElementById('signedSentinel');
+const signedLoading = document.getElementById('signedLoading');
+const signedLoadedDocs = document.getElementById('signedLoadedDocs');
 
-let currentPage = 1;
-let allDocuments = [];
+let nextCursor = null;
+let hasMore = true;
+let isLoading = false;
+let loadedCount = 0;
+// The in-flight load; a reset aborts it and a replaced load drops its response.
+let loadController = null;
 
-async function loadSignedDocuments() {
+async function loadSignedDocuments(reset = false) {
+    if (reset) {
+        if (loadController) loadController.abort();
+        loadController = null;
+        isLoading = false;
+        nextCursor = null;
+        hasMore = true;
+        loadedCount = 0;
+        signedDocsList.innerHTML = '';
+    }
+    if (isLoading || !hasMore) return;
+    isLoading = true;
+    const controller = new AbortController();
+    loadController = controller;
+    signedLoading.style.display = 'block';
     try {
-        const response = await fetch('/documents/signed', {
-            credentials: 'same-origin'
+        const params = new URLSearchParams({ limit: signedDocsPerPage.value });
+        if (nextCursor) params.set('cursor', nextCursor);
+        const response = await fetch(`/documents/signed?${params}`, {
+            credentials: 'same-origin',
+            signal: controller.signal
         });
         const data = await response.json();
+        if (controller !== loadController) return;
+        const documents = data.documents || [];
+        
+        nextCursor = data.next_cursor || null;
+        hasMore = Boolean(nextCursor);
         
-        if (!data.documents || data.documents.length === 0) {
-            signedDocsList.innerHTML = '';
+        if (loadedCount === 0 && documents.length === 0) {
             signedEmptyState.style.display = 'block';
-            signedPagination.innerHTML = '';
-            updateShowingInfo(0, 0, 0);
+            updateLoadedInfo();
             return;
         }
         
-        allDocuments = data.documents;
         signedEmptyState.style.display = 'none';
-        renderDocuments();
+        appendDocuments(documents);
     } catch (error) {
-        console.error('Error loading signed documents:', error);
+        if (error.name !== 'AbortError') {
+            console.error('Error loading signed documents:', error);
+        }
+    } finally {
+        if (controller === loadController) {
+            loadController = null;
+            isLoading = false;
+            signedLoading.style.display = 'none';
+        }
     }
 }
 
-function renderDocuments() {
-    const perPage = parseInt(signedDocsPerPage.value);
-    const start = (currentPage - 1) * perPage;
-    const end = start + perPage;
-    const pageDocuments = allDocuments.slice(start, end);
-    
-    updateShowingInfo(start + 1, Math.min(end, allDocuments.length), allDocuments.length);
-    renderPagination(Math.ceil(allDocuments.length / perPage));
-    
-    signedDocsList.innerHTML = pageDocuments.map((doc, index) => {
+function appendDocuments(documents) {
+    const start = loadedCount;
+    signedDocsList.insertAdjacentHTML('beforeend', documents.map((doc, index) => {
         const partiesInfo = doc.parties.map(p => {
             const info = [];
             if (p.role === 'initiator') info.push('Инициатор');
@@ -80,72 +103,25 @@ function renderDocuments() {
                 </td>
             </tr>
         `;
-    }).join('');
+    }).join(''));
+    loadedCount += documents.length;
+    updateLoadedInfo();
 }
 
-function renderPagination(totalPages) {
-    if (totalPages <= 1) {
-        signedPagination.innerHTML = '';
-        return;
-    }
-
-    let pages = '';
-    pages += `
-        <li class="page-item ${currentPage === 1 ? 'disabled' : ''}">
-            <a class="page-link" href="#" data-page="${currentPage - 1}">
-                <i class="bi bi-chevron-left"></i>
-            </a>
-        </li>
-    `;
-    
-    for (let i = 1; i <= totalPages; i++) {
-        if (i === 1 || i === totalPages || (i >= currentPage - 1 && i <= currentPage + 1)) {
-            pages += `
-                <li class="page-item ${i === currentPage ? 'active' : ''}">
-                    <a class="page-link" href="#" data-page="${i}">${i}</a>
-                </li>
-            `;
-        } else if (i === currentPage - 2 || i === currentPage + 2) {
-            pages += `
-                <li class="page-item disabled">
-                    <span class="page-link">...</span>
-                </li>
-            `;
-        }
-    }
-    
-    pages += `
-        <li class="page-item ${currentPage === totalPages ? 'disabled' : ''}">
-            <a class="page-link" href="#" data-page="${currentPage + 1}">
-                <i class="bi bi-chevron-right"></i>
-            </a>
-        </li>
-    `;
-    
-    signedPagination.innerHTML = pages;
-}
-
-function updateShowingInfo(from, to, total) {
-    signedShowingFrom.textContent = from;
-    signedShowingTo.textContent = to;
-    signedTotalDocs.textContent = total;
+function updateLoadedInfo() {
+    signedLoadedDocs.textContent = loadedCount;
 }
 
 signedDocsPerPage.addEventListener('change', () => {
-    currentPage = 1;
-    renderDocuments();
+    loadSignedDocuments(true);
 });
 
-signedPagination.addEventListener('click', (e) => {
-    e.preventDefault();
-    const pageLink = e.target.closest('[data-page]');
-    if (pageLink) {
-        const newPage = parseInt(pageLink.dataset.page);
-        if (newPage !== currentPage && newPage > 0) {
-            currentPage = newPage;
-            renderDocuments();
-        }
+const signedObserver = new IntersectionObserver((entries) => {
+    if (entries.some(entry => entry.isIntersecting)) {
+        loadSignedDocuments();
     }
-});
+}, { rootMargin: '200px' });
 
-document.addEventListener('DOMContentLoaded', loadSignedDocuments);
\ No newline at end of file
+document.addEventListener('DOMContentLoaded', () => {
+    loadSignedDocuments(true).then(() => signedObserver.observe(signedSentinel));
+});
@@ -0,0 +1,39 @@
+"""Tests run against a real PostgreSQL given by TEST_DATABASE_URL (its schema is
+dropped and recreated); tests that need the database are skipped without it."""
+import os
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+    os.environ["DATABASE_READ_URL"] = ""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from db.models import Base
+from db.session import engine, init_db
+
+
+@pytest_asyncio.fixture
+async def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await init_db()
+    yield engine
+    # Pooled asyncpg connections belong to this test's event loop.
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(database):
+    """SQL statements sent on the primary engine; clear() it before the part under test."""
+    issued = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        issued.append(statement)
+
+    event.listen(database.sync_engine, "before_cursor_execute", record)
+    yield issued
+    event.remove(database.sync_engine, "before_cursor_execute", record)
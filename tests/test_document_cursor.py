@@ -0,0 +1,27 @@
+import base64
+import json
+from datetime import datetime, timezone
+import pytest
+from services.document_service import decode_cursor, encode_cursor, InvalidCursorError
+
+
+def _cursor(data) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 18, 12, 30, 5, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    _cursor(["2026-10-18T12:00:00", 1]),
+    _cursor({"c": "yesterday", "i": 1}),
+    _cursor({"c": datetime(2026, 10, 18, tzinfo=timezone.utc).isoformat(), "i": 1}),
+    _cursor({"c": "2026-10-18T12:00:00", "i": 0}),
+    _cursor({"c": "2026-10-18T12:00:00", "i": 2 ** 40}),
+])
+def test_unusable_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
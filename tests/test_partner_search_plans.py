@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import func, select, text
+from core.settings import settings
+from db.session import SessionLocal
+from routers.documents import _identifier_search, _email_search, _text_search
+
+SEEDED_USERS = 1_000_000
+LIMIT = 10
+
+# Query class -> (query, indexes its plan has to read through Bitmap Index Scans)
+CASES = {
+    "identifier": (_identifier_search, "0000001234", ("ix_users_iin_prefix", "ix_users_bin_prefix")),
+    "email": (_email_search, "user123456@", ("ix_users_email_trgm",)),
+    "text": (
+        _text_search,
+        "Садыкова",
+        (
+            "ix_users_full_name_trgm",
+            "ix_users_organization_trgm",
+            "ix_users_email_trgm",
+            "ix_users_iin_trgm",
+            "ix_users_bin_trgm",
+        ),
+    ),
+}
+
+
+async def _seed_users(session) -> None:
+    await session.execute(text(
+        "INSERT INTO users (iin, bin, full_name, organization, email, created_at, updated_at) "
+        "SELECT lpad(i::text, 12, '0'), "
+        "CASE WHEN i % 3 = 0 THEN lpad((i * 7)::text, 12, '0') END, "
+        "CASE WHEN i % 1000 = 0 THEN 'Садыкова Айгерим' ELSE 'Пользователь ' || md5(i::text) END, "
+        "CASE WHEN i % 3 = 0 THEN 'ТОО ' || md5((i * 7)::text) END, "
+        "'user' || i || '@example.kz', now(), now() "
+        "FROM generate_series(1, :count) AS i"
+    ), {"count": SEEDED_USERS})
+    await session.commit()
+    await session.execute(text("ANALYZE users"))
+
+
+def _explain_sql(engine, stmt) -> str:
+    return "EXPLAIN " + str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.asyncio
+async def test_partner_search_uses_indexes(database):
+    async with SessionLocal() as session:
+        if await session.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'")) == 0:
+            pytest.skip("pg_trgm is not installed")
+        await _seed_users(session)
+
+        plans = {}
+        for kind, (build, query, indexes) in CASES.items():
+            await session.execute(
+                select(func.set_config("pg_trgm.similarity_threshold", str(settings.PARTNER_SEARCH_THRESHOLD), True))
+            )
+            connection = await session.connection()
+            res = await connection.exec_driver_sql(_explain_sql(database, build(query, LIMIT)))
+            plans[kind] = "\n".join(row[0] for row in res)
+
+    for kind, (_, _, indexes) in CASES.items():
+        plan = plans[kind]
+        assert "Seq Scan on users" not in plan, plan
+        for index in indexes:
+            assert f"Bitmap Index Scan on {index}" in plan, plan
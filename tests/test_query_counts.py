@@ -0,0 +1,109 @@
+import base64
+import itertools
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import insert
+from db.models import User, Document, DocumentParticipant
+from db.session import SessionLocal
+from routers import documents
+from services.document_service import get_pending_documents, get_signed_documents, MAX_PAGE_SIZE
+
+DOCUMENTS = 5
+
+_iins = itertools.count(900000000001)
+
+
+async def _enqueue_nothing(job_id: str) -> None:
+    pass
+
+
+async def _add_users(session, count: int):
+    return list((await session.scalars(
+        insert(User)
+        .values([{"iin": str(next(_iins)), "full_name": f"User {i}"} for i in range(count)])
+        .returning(User.id)
+    )).all())
+
+
+async def _seed_documents(count: int, participant_status: str) -> int:
+    """Seeds count documents shared by an owner, a second signer and the returned user."""
+    async with SessionLocal() as session:
+        owner_id, signer_id, user_id = await _add_users(session, 3)
+        documents = (await session.execute(
+            insert(Document)
+            .values([
+                {"owner_id": owner_id, "title": f"doc {i}", "file_name": f"doc{i}.pdf", "status": "pending"}
+                for i in range(count)
+            ])
+            .returning(Document.id, Document.created_at)
+        )).all()
+        await session.execute(insert(DocumentParticipant).values([
+            {
+                "document_id": doc.id,
+                "document_created_at": doc.created_at,
+                "user_id": participant_id,
+                "role": role,
+                "status": status,
+            }
+            for doc in documents
+            for participant_id, role, status in (
+                (owner_id, "initiator", "pending"),
+                (signer_id, "signer", "pending"),
+                (user_id, "signer", participant_status),
+            )
+        ]))
+        await session.commit()
+    return user_id
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("listing, participant_status", [
+    (get_pending_documents, "pending"),
+    (get_signed_documents, "signed"),
+])
+async def test_listing_query_count_does_not_grow_with_documents(database, statements, listing, participant_status):
+    counts = []
+    for count in (DOCUMENTS, DOCUMENTS * 10):
+        user_id = await _seed_documents(count, participant_status)
+        statements.clear()
+        async with SessionLocal() as session:
+            page = await listing(session, user_id, limit=MAX_PAGE_SIZE)
+        assert len(page["documents"]) == count
+        assert all(len(doc["parties"]) == 3 for doc in page["documents"])
+        counts.append(len(statements))
+
+    # the page itself, then every party of every document on it
+    assert counts == [2, 2]
+
+
+async def _create_document(user_id: int, partner_ids) -> httpx.Response:
+    app = FastAPI()
+    app.include_router(documents.router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        client.cookies.set("uid", str(user_id))
+        return await client.post("/documents", json={
+            "file_name": "contract.pdf",
+            "file_base64": base64.b64encode(b"%PDF-1.4 contract").decode(),
+            "signature": "cms",
+            "participant_user_ids": partner_ids,
+        })
+
+
+@pytest.mark.asyncio
+async def test_create_document_query_count_does_not_grow_with_partners(database, statements, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(documents, "enqueue_registration", _enqueue_nothing)
+    async with SessionLocal() as session:
+        owner_id, *partner_ids = await _add_users(session, 5)
+        await session.commit()
+
+    counts = []
+    for partners in (partner_ids[:1], partner_ids):
+        statements.clear()
+        response = await _create_document(owner_id, partners)
+        assert response.status_code == 202
+        counts.append(len(statements))
+
+    # user check, blob, document, participants, job
+    assert counts == [5, 5]
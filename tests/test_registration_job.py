@@ -0,0 +1,111 @@
+import asyncio
+from datetime import timedelta
+import httpx
+import pytest
+from sqlalchemy import insert, select, update
+from core.settings import settings
+from db.models import User, Document, RegistrationJob, get_current_time
+from db.session import SessionLocal
+from services import registration_service, sigex_client
+from services.blob_service import store_blob
+from services.registration_job_service import recover_stale_jobs, run_registration_job
+
+SIGEX_DELAY = 0.2
+JOBS = 5
+
+
+class _NoSignaturePage:
+    async def add_signature_page(self, file_path, signature_details):
+        return file_path
+
+
+async def _create_jobs(count: int):
+    async with SessionLocal() as session:
+        owner_id = (await session.execute(
+            insert(User).values(iin="900101300001", full_name="Owner").returning(User.id)
+        )).scalar_one()
+        sha256 = await store_blob(session, b"%PDF-1.4 test")
+        jobs = []
+        for i in range(count):
+            document_id = (await session.execute(
+                insert(Document)
+                .values(owner_id=owner_id, title=f"doc {i}", file_name=f"doc{i}.pdf", blob_sha256=sha256, status="registering")
+                .returning(Document.id)
+            )).scalar_one()
+            jobs.append((await session.execute(
+                insert(RegistrationJob)
+                .values(document_id=document_id, signature="cms", participant_count=1, status="queued")
+                .returning(RegistrationJob.id)
+            )).scalar_one())
+        await session.commit()
+    return jobs
+
+
+@pytest.mark.asyncio
+async def test_no_connection_held_while_sigex_is_called(database, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(registration_service, "PDFSignatureService", _NoSignaturePage)
+    checked_out = []
+    registered = iter(range(JOBS))
+    # Every job waits here in the same SIGEX call, so the pool is sampled
+    # while all of them are in the external call at once.
+    all_calling = asyncio.Barrier(JOBS)
+
+    async def slow_sigex(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        await all_calling.wait()
+        checked_out.append(database.pool.checkedout())
+        await asyncio.sleep(SIGEX_DELAY)
+        if request.method == "POST" and request.url.path == "/api":
+            return httpx.Response(200, json={"documentId": f"sigex-{next(registered)}"})
+        if request.url.path.endswith("/data"):
+            return httpx.Response(200, json={})
+        return httpx.Response(200, json={"signaturesTotal": 0, "signatures": []})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(slow_sigex))
+    monkeypatch.setattr(sigex_client, "_client", client)
+    try:
+        job_ids = await _create_jobs(JOBS)
+        await asyncio.gather(*(run_registration_job(job_id) for job_id in job_ids))
+    finally:
+        await client.aclose()
+
+    # register, hash fixation and fetch for every job
+    assert len(checked_out) == JOBS * 3
+    assert max(checked_out) == 0
+
+    async with SessionLocal() as session:
+        jobs = (await session.execute(select(RegistrationJob.status, RegistrationJob.s_id))).all()
+        documents = (await session.execute(select(Document.status, Document.s_id))).all()
+    assert {job.status for job in jobs} == {"succeeded"}
+    assert {document.status for document in documents} == {"pending"}
+    assert sorted(document.s_id for document in documents) == sorted(job.s_id for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_recovery_requeues_once_and_fails_exhausted_jobs(database, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    unclaimed, exhausted = await _create_jobs(2)
+    long_ago = get_current_time() - timedelta(seconds=settings.REGISTRATION_LEASE_SECONDS * 2)
+    async with SessionLocal() as session:
+        await session.execute(
+            update(RegistrationJob).where(RegistrationJob.id == unclaimed).values(updated_at=long_ago)
+        )
+        await session.execute(
+            update(RegistrationJob)
+            .where(RegistrationJob.id == exhausted)
+            .values(status="running", attempts=settings.REGISTRATION_MAX_ATTEMPTS, lease_expires_at=long_ago)
+        )
+        await session.commit()
+
+    assert sorted(await recover_stale_jobs()) == sorted([unclaimed, exhausted])
+    # Both were just handed out again, so the next pass leaves them alone.
+    assert await recover_stale_jobs() == []
+
+    await run_registration_job(exhausted)
+    async with SessionLocal() as session:
+        job = (await session.execute(
+            select(RegistrationJob.status, RegistrationJob.error).where(RegistrationJob.id == exhausted)
+        )).one()
+    assert job.status == "failed"
+    assert job.error == f"Lease expired after {settings.REGISTRATION_MAX_ATTEMPTS} attempts"